@@ -8,16 +8,50 @@ Orchestrates RAG-based chat flows:
 
 import json
 import logging
-from typing import List, Dict, Optional
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from config import settings
 from core.database import DatabaseManager
 from core.models import TextChunk, ChatMessage
 from ai.llm_client import create_llm_client, LLMClient
-from ai.rag_engine import EmbeddingEngine, search_similar_chunks
+from ai.rag_engine import build_embedding_matrix, get_embed_engine, search_similar_chunks
+from ai.semantic_cache import get_semantic_cache
+from ai.vector_index import get_library_index
 
 logger = logging.getLogger(__name__)
 
+# Query embedding runs here so it overlaps with chunk/index loading on the caller's thread
+_embed_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rag-embed")
+
+# Shared across handlers (the sidebar keeps one, other callers build their own):
+# paper_id -> (chunks_version, chunks, normalized matrix), least recently used first
+_PAPER_MATRIX_CACHE_SIZE = 8
+_paper_matrix_cache: "OrderedDict[int, Tuple[int, List[TextChunk], np.ndarray]]" = OrderedDict()
+_paper_matrix_lock = threading.Lock()
+
+# Conversation turns sent along with each question (last 2 exchanges)
+HISTORY_MESSAGES = 4
+
+_RAG_SYSTEM_PROMPT = (
+    "You are PaperMiner AI, an academic research assistant. "
+    "Answer the user's question based on the following passages from their research papers. "
+    "Cite passage numbers [Passage N] when referencing specific content. "
+    "If the passages don't contain enough information to answer, say so honestly. "
+    "Maintain academic rigor and precision."
+)
+
+# (cache scope, query embedding future, retriever) for one RAG request
+RagRequest = Tuple[
+    Tuple,
+    "Future[np.ndarray]",
+    Callable[[np.ndarray, int], List[Tuple[TextChunk, float]]],
+]
+
 
 class ChatHandler:
     """
@@ -28,24 +62,38 @@ class ChatHandler:
     def __init__(self, db: DatabaseManager) -> None:
         self.db = db
         self.llm: LLMClient = create_llm_client()
-        self.embed_engine = EmbeddingEngine()
-        self.history: List[Dict[str, str]] = []
+        self.embed_engine = get_embed_engine()
+        self.top_k = settings.top_k_retrieval
+        # Only the last exchanges are ever sent, so older turns are dropped on append
+        self.history: Deque[Dict[str, str]] = deque(maxlen=HISTORY_MESSAGES)
 
     def chat_with_paper(self, paper_id: int, user_message: str) -> str:
         """Answer a question using RAG on the currently open paper."""
-        chunks = self.db.get_chunks(paper_id)
-        if not chunks:
+        request = self._paper_request(paper_id, user_message)
+        if request is None:
             return self._plain_chat(user_message, context_note="(This paper has not been indexed for RAG yet.)")
+        return self._rag_chat(user_message, *request)
 
-        return self._rag_chat(user_message, chunks)
+    def chat_with_paper_stream(self, paper_id: int, user_message: str) -> Iterator[str]:
+        """Streaming variant of chat_with_paper. Yields response text chunks."""
+        request = self._paper_request(paper_id, user_message)
+        if request is None:
+            return self._plain_chat_stream(user_message, context_note="(This paper has not been indexed for RAG yet.)")
+        return self._rag_chat_stream(user_message, *request)
 
     def chat_with_library(self, user_message: str) -> str:
         """Answer a question using RAG across the entire library."""
-        chunks = self.db.get_all_chunks()
-        if not chunks:
+        request = self._library_request(user_message)
+        if request is None:
             return self._plain_chat(user_message, context_note="(No papers have been indexed in the library yet.)")
+        return self._rag_chat(user_message, *request)
 
-        return self._rag_chat(user_message, chunks)
+    def chat_with_library_stream(self, user_message: str) -> Iterator[str]:
+        """Streaming variant of chat_with_library. Yields response text chunks."""
+        request = self._library_request(user_message)
+        if request is None:
+            return self._plain_chat_stream(user_message, context_note="(No papers have been indexed in the library yet.)")
+        return self._rag_chat_stream(user_message, *request)
 
     def explain_text(self, text: str) -> str:
         """Generate an academic explanation for selected text."""
@@ -71,77 +119,188 @@ class ChatHandler:
         """Plain chat without RAG context."""
         return self._plain_chat(user_message)
 
+    def free_chat_stream(self, user_message: str) -> Iterator[str]:
+        """Streaming plain chat without RAG context."""
+        return self._plain_chat_stream(user_message)
+
     # ---- Internal Methods ----
 
-    def _rag_chat(self, user_message: str, chunks: List[TextChunk]) -> str:
-        """Perform RAG: embed query → retrieve → generate answer."""
-        # Generate query embedding
-        query_emb = self.embed_engine.embed_texts([user_message])
-        if not query_emb or not query_emb[0]:
-            return self._plain_chat(user_message, context_note="(Embedding generation failed, answering without context.)")
+    def _paper_request(self, paper_id: int, user_message: str) -> Optional[RagRequest]:
+        """Start embedding the query and load the paper's chunks. None if the paper is not indexed."""
+        # Cheap check first: an unindexed paper must not load the embedding model
+        if not self.db.has_embedded_chunks(paper_id):
+            return None
+        query_future = _embed_pool.submit(self.embed_engine.embed_texts, [user_message])
+
+        # Per-paper N is small: brute-force NumPy search beats an ANN index here
+        chunks, matrix = self._paper_matrix(paper_id)
+        if not chunks:
+            query_future.cancel()
+            return None
+
+        return (
+            ("paper", paper_id, id(self.db), self.db.chunks_version),
+            query_future,
+            lambda q, k: search_similar_chunks(q, chunks, top_k=k, matrix=matrix),
+        )
+
+    def _library_request(self, user_message: str) -> Optional[RagRequest]:
+        """Start embedding the query and refresh the library index. None if nothing is indexed."""
+        if not self.db.has_embedded_chunks():
+            return None
+        query_future = _embed_pool.submit(self.embed_engine.embed_texts, [user_message])
+
+        index = get_library_index()
+        if not index.refresh(self.db):
+            query_future.cancel()
+            return None
+
+        return (
+            ("library", id(self.db), self.db.chunks_version),
+            query_future,
+            lambda q, k: index.search(self.db, q, top_k=k),
+        )
+
+    def _paper_matrix(self, paper_id: int) -> Tuple[List[TextChunk], np.ndarray]:
+        """Return (chunks, matrix) for a paper, hitting SQLite only when text_chunks changed."""
+        version = self.db.chunks_version
+        with _paper_matrix_lock:
+            cached = _paper_matrix_cache.get(paper_id)
+            if cached is not None and cached[0] == version:
+                _paper_matrix_cache.move_to_end(paper_id)
+                return cached[1], cached[2]
+
+        chunks, matrix = build_embedding_matrix(self.db.get_chunks(paper_id))
+        with _paper_matrix_lock:
+            _paper_matrix_cache[paper_id] = (version, chunks, matrix)
+            _paper_matrix_cache.move_to_end(paper_id)
+            while len(_paper_matrix_cache) > _PAPER_MATRIX_CACHE_SIZE:
+                _paper_matrix_cache.popitem(last=False)
+        return chunks, matrix
+
+    def _rag_messages(
+        self,
+        user_message: str,
+        cache_scope: Tuple,
+        query_future: "Future[np.ndarray]",
+        retrieve: Callable[[np.ndarray, int], List[Tuple[TextChunk, float]]],
+    ) -> Tuple[Optional[str], List[Dict[str, str]], Optional[np.ndarray]]:
+        """
+        Resolve the (already submitted) query embedding and retrieve context.
+        Returns (cached_response, messages, query_embedding); on a semantic cache hit
+        messages is empty, and query_embedding is None whenever the answer must not be cached.
+        """
+        query_emb = query_future.result()
+        if query_emb.size == 0:
+            return None, self._plain_messages(user_message, "(Embedding generation failed, answering without context.)"), None
+        query_emb = query_emb[0]
+
+        # Answers shaped by earlier turns are neither served from nor stored in the cache
+        cacheable = not self.history
+        # Near-duplicate question against the same chunks: reuse the earlier answer
+        cached = get_semantic_cache().lookup(query_emb, cache_scope) if cacheable else None
+        if cached is not None:
+            return cached, [], None
 
         # Retrieve relevant chunks
-        top_k = settings.top_k_retrieval
-        relevant = search_similar_chunks(query_emb[0], chunks, top_k=top_k)
+        relevant = retrieve(query_emb, self.top_k)
 
         if not relevant:
-            return self._plain_chat(user_message, context_note="(No relevant passages found in the paper(s).)")
+            return None, self._plain_messages(user_message, "(No relevant passages found in the paper(s).)"), None
 
         # Build context from retrieved chunks
-        context_parts = []
-        for i, (chunk, score) in enumerate(relevant, 1):
-            context_parts.append(
-                f"[Passage {i}] (Page {chunk.page_start}, Relevance: {score:.2f})\n{chunk.text}"
-            )
-        context_text = "\n\n".join(context_parts)
-
-        # Build messages with context
-        system_prompt = (
-            "You are PaperMiner AI, an academic research assistant. "
-            "Answer the user's question based on the following passages from their research papers. "
-            "Cite passage numbers [Passage N] when referencing specific content. "
-            "If the passages don't contain enough information to answer, say so honestly. "
-            "Maintain academic rigor and precision."
+        context_text = "\n\n".join(
+            f"[Passage {i}] (Page {chunk.page_start}, Relevance: {score:.2f})\n{chunk.text}"
+            for i, (chunk, score) in enumerate(relevant, 1)
         )
 
+        # System prompt, recent history for continuity, then the question with context
         messages = [
-            {"role": "system", "content": system_prompt},
+            {"role": "system", "content": _RAG_SYSTEM_PROMPT},
+            *self.history,
             {"role": "user", "content": f"## Retrieved Context:\n\n{context_text}\n\n## Question:\n{user_message}"},
         ]
+        return None, messages, query_emb if cacheable else None
 
-        # Include recent history for continuity
-        if self.history:
-            recent = self.history[-4:]  # Last 2 exchanges
-            messages = [messages[0]] + recent + [messages[-1]]
+    def _rag_chat(
+        self,
+        user_message: str,
+        cache_scope: Tuple,
+        query_future: "Future[np.ndarray]",
+        retrieve: Callable[[np.ndarray, int], List[Tuple[TextChunk, float]]],
+    ) -> str:
+        """Perform RAG: (already submitted) query embedding → retrieve → generate answer."""
+        cached, messages, query_emb = self._rag_messages(user_message, cache_scope, query_future, retrieve)
+        if cached is not None:
+            self._remember(user_message, cached)
+            return cached
 
         response = self.llm.chat(messages)
+        if query_emb is not None and not response.startswith("[Error]"):
+            get_semantic_cache().add(query_emb, cache_scope, response)
 
-        # Update history
-        self.history.append({"role": "user", "content": user_message})
-        self.history.append({"role": "assistant", "content": response})
-
+        self._remember(user_message, response)
         return response
 
-    def _plain_chat(self, user_message: str, context_note: str = "") -> str:
-        """Fallback: chat without RAG context."""
+    def _rag_chat_stream(
+        self,
+        user_message: str,
+        cache_scope: Tuple,
+        query_future: "Future[np.ndarray]",
+        retrieve: Callable[[np.ndarray, int], List[Tuple[TextChunk, float]]],
+    ) -> Iterator[str]:
+        """Streaming RAG: yields answer chunks as they arrive, then records the full answer."""
+        cached, messages, query_emb = self._rag_messages(user_message, cache_scope, query_future, retrieve)
+        if cached is not None:
+            self._remember(user_message, cached)
+            yield cached
+            return
+
+        parts: List[str] = []
+        failed = False
+        for piece in self.llm.chat_stream(messages):
+            failed = failed or piece.startswith("\n[Error]")
+            parts.append(piece)
+            yield piece
+
+        response = "".join(parts)
+        if query_emb is not None and not failed:
+            get_semantic_cache().add(query_emb, cache_scope, response)
+        self._remember(user_message, response)
+
+    def _plain_messages(self, user_message: str, context_note: str = "") -> List[Dict[str, str]]:
+        """Build the message list for a chat without RAG context."""
         system_prompt = (
             "You are PaperMiner AI, an academic research assistant. "
             "Help the user with their research questions. "
             f"{context_note}"
         )
 
-        messages = [{"role": "system", "content": system_prompt}]
-        if self.history:
-            messages.extend(self.history[-4:])
-        messages.append({"role": "user", "content": user_message})
+        return [
+            {"role": "system", "content": system_prompt},
+            *self.history,
+            {"role": "user", "content": user_message},
+        ]
 
-        response = self.llm.chat(messages)
+    def _plain_chat(self, user_message: str, context_note: str = "") -> str:
+        """Fallback: chat without RAG context."""
+        response = self.llm.chat(self._plain_messages(user_message, context_note))
+        self._remember(user_message, response)
+        return response
+
+    def _plain_chat_stream(self, user_message: str, context_note: str = "") -> Iterator[str]:
+        """Streaming fallback: chat without RAG context."""
+        parts: List[str] = []
+        for piece in self.llm.chat_stream(self._plain_messages(user_message, context_note)):
+            parts.append(piece)
+            yield piece
+        self._remember(user_message, "".join(parts))
 
+    def _remember(self, user_message: str, response: str) -> None:
+        """Append one exchange to the conversation history."""
         self.history.append({"role": "user", "content": user_message})
         self.history.append({"role": "assistant", "content": response})
 
-        return response
-
     def clear_history(self) -> None:
         """Reset conversation history."""
         self.history.clear()
@@ -4,17 +4,52 @@ Provides a unified interface for LLM API calls.
 Supports: DeepSeek, Zhipu/GLM, SiliconFlow, OpenAI-compatible endpoints.
 """
 
+import atexit
 import json
 import logging
-import httpx
+import threading
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional, Generator, AsyncGenerator
 
 from config import settings, LLMConfig
+from core.net import http2_available
 
 logger = logging.getLogger(__name__)
 
 
+_httpx = None
+
+
+def _get_httpx():
+    """Import httpx on first use; it adds noticeable import time to a cold start."""
+    global _httpx
+    if _httpx is None:
+        import httpx
+        _httpx = httpx
+    return _httpx
+
+
+# --- Shared Connection Pool ---
+# Handlers (and their clients) are short-lived; the keep-alive pool outlives them
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_llm_http_client():
+    """Return the process-wide httpx.Client for LLM calls (thread-safe, keep-alive pooled)."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            httpx = _get_httpx()
+            _http_client = httpx.Client(
+                timeout=httpx.Timeout(60.0, connect=10.0),
+                limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+                http2=http2_available(),
+            )
+            atexit.register(_http_client.close)
+        return _http_client
+
+
 class LLMClient(ABC):
     """Abstract base class for LLM interactions."""
 
@@ -47,7 +82,8 @@ class OpenAICompatibleClient(LLMClient):
             "Authorization": f"Bearer {self.config.api_key}",
             "Content-Type": "application/json",
         }
-        self.timeout = httpx.Timeout(60.0, connect=10.0)
+        # Shared pool: repeat requests reuse the open TCP+TLS connection to the provider
+        self._client = get_llm_http_client()
         logger.info(f"LLM client initialized: {self.config.provider} / {self.config.model_name}")
 
     def chat(self, messages: List[Dict[str, str]], **kwargs) -> str:
@@ -60,16 +96,14 @@ class OpenAICompatibleClient(LLMClient):
             "stream": False,
         }
 
+        httpx = _get_httpx()
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload,
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data["choices"][0]["message"]["content"]
+            response = self._client.post(
+                f"{self.base_url}/chat/completions", json=payload, headers=self.headers,
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data["choices"][0]["message"]["content"]
         except httpx.TimeoutException:
             logger.error("LLM API request timed out.")
             return "[Error] API request timed out. Please try again."
@@ -91,29 +125,28 @@ class OpenAICompatibleClient(LLMClient):
         }
 
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                with client.stream(
-                    "POST",
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload,
-                ) as response:
-                    response.raise_for_status()
-                    for line in response.iter_lines():
-                        if not line or line.startswith(":"):
+            with self._client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=self.headers,
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line or line.startswith(":"):
+                        continue
+                    if line.startswith("data: "):
+                        data_str = line[6:]
+                        if data_str.strip() == "[DONE]":
+                            break
+                        try:
+                            data = json.loads(data_str)
+                            delta = data["choices"][0].get("delta", {})
+                            content = delta.get("content", "")
+                            if content:
+                                yield content
+                        except json.JSONDecodeError:
                             continue
-                        if line.startswith("data: "):
-                            data_str = line[6:]
-                            if data_str.strip() == "[DONE]":
-                                break
-                            try:
-                                data = json.loads(data_str)
-                                delta = data["choices"][0].get("delta", {})
-                                content = delta.get("content", "")
-                                if content:
-                                    yield content
-                            except json.JSONDecodeError:
-                                continue
         except Exception as e:
             logger.error(f"LLM streaming error: {e}")
             yield f"\n[Error] {str(e)}"
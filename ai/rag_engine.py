@@ -3,19 +3,23 @@ PaperMiner - RAG Engine
 Responsible for:
   1. PDF text extraction (via pymupdf/fitz)
   2. Text chunking with overlap
-  3. Embedding generation (local sentence-transformers or API)
-  4. Simple vector similarity search (cosine similarity for MVP)
+  3. Embedding generation (local ONNX Runtime / sentence-transformers, or API)
+  4. Vectorized similarity search (cosine similarity via NumPy matmul)
 """
 
-import json
+import asyncio
 import logging
-import math
 import os
+import re
+import threading
 from pathlib import Path
 from typing import List, Tuple, Optional
 
-from config import settings, HF_MIRROR_URL
+import numpy as np
+
+from config import settings, HF_MIRROR_URL, ONNX_MODEL_DIR
 from core.models import TextChunk
+from core.quantization import dequantize_embeddings, quantize_embeddings
 
 logger = logging.getLogger(__name__)
 
@@ -35,13 +39,11 @@ def extract_text_from_pdf(file_path: str) -> List[Tuple[int, str]]:
 
     pages: List[Tuple[int, str]] = []
     try:
-        doc = fitz.open(file_path)
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text("text")
-            if text.strip():
-                pages.append((page_num + 1, text.strip()))
-        doc.close()
+        with fitz.open(file_path) as doc:
+            for page_num, page in enumerate(doc, 1):
+                text = page.get_text("text").strip()
+                if text:
+                    pages.append((page_num, text))
         logger.info(f"Extracted text from {len(pages)} pages of {os.path.basename(file_path)}")
     except Exception as e:
         logger.error(f"Failed to extract text from {file_path}: {e}")
@@ -51,31 +53,36 @@ def extract_text_from_pdf(file_path: str) -> List[Tuple[int, str]]:
 
 # ---- Text Chunking ----
 
+_WORD_RE = re.compile(r"\S+")
+
+
 def chunk_text(
     pages: List[Tuple[int, str]],
-    chunk_size: int = 512,
-    chunk_overlap: int = 64,
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
 ) -> List[TextChunk]:
     """
     Split page text into overlapping chunks for embedding.
     Each chunk tracks which page(s) it came from.
+    Sizes default to the app settings; they are bound to locals once per call.
     """
     chunk_size = chunk_size or settings.chunk_size
     chunk_overlap = chunk_overlap or settings.chunk_overlap
 
     chunks: List[TextChunk] = []
     chunk_index = 0
+    step = max(chunk_size - chunk_overlap, 1)
 
     for page_num, text in pages:
-        words = text.split()
-        start = 0
+        # Word boundaries in one pass; each chunk is then a single slice of the page text
+        spans = [m.span() for m in _WORD_RE.finditer(text)]
+        n_words = len(spans)
 
-        while start < len(words):
-            end = start + chunk_size
-            chunk_words = words[start:end]
-            chunk_text_str = " ".join(chunk_words)
+        for start in range(0, n_words, step):
+            end = min(start + chunk_size, n_words)
+            chunk_text_str = text[spans[start][0]:spans[end - 1][1]]
 
-            if len(chunk_text_str.strip()) > 20:  # Skip very short chunks
+            if len(chunk_text_str) > 20:  # Skip very short chunks
                 chunks.append(TextChunk(
                     chunk_index=chunk_index,
                     text=chunk_text_str,
@@ -84,129 +91,364 @@ def chunk_text(
                 ))
                 chunk_index += 1
 
-            start += chunk_size - chunk_overlap
-
     logger.info(f"Created {len(chunks)} text chunks.")
     return chunks
 
 
 # ---- Embedding Generation ----
 
+EMBED_BATCH_SIZE = 64
+API_EMBED_BATCH_SIZE = 32   # texts per /embeddings request
+API_EMBED_CONCURRENCY = 8   # requests in flight at once
+ONNX_MAX_SEQ_LENGTH = 256   # matches all-MiniLM-L6-v2's max_seq_length
+
+
+def _l2_normalize(embeddings: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length in place (zero rows are left as-is)."""
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    embeddings /= norms
+    return embeddings
+
+
+def _empty_embeddings() -> np.ndarray:
+    """Embedding result used when generation fails."""
+    return np.empty((0, 0), dtype=np.float32)
+
+
+class OnnxEmbeddingModel:
+    """
+    Sentence embedding via ONNX Runtime (INT8-quantized MiniLM export).
+    Tokenizer → session.run → mean-pool → L2-normalize, without PyTorch.
+    """
+
+    def __init__(self, model_dir: Path) -> None:
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_file = model_dir / "model_quantized.onnx"
+        if not model_file.exists():
+            model_file = model_dir / "model.onnx"
+
+        self._tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self._tokenizer.enable_truncation(max_length=ONNX_MAX_SEQ_LENGTH)
+        self._tokenizer.enable_padding()
+        self._session = ort.InferenceSession(str(model_file), providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self._session.get_inputs()}
+
+    def encode(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE, **_) -> np.ndarray:
+        """Embed texts in batches; returns L2-normalized float32 rows."""
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self._tokenizer.encode_batch(texts[start:start + batch_size])
+            mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feeds = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": mask,
+                "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            hidden = self._session.run(
+                None, {k: v for k, v in feeds.items() if k in self._input_names}
+            )[0]
+
+            weights = mask[:, :, None].astype(np.float32)
+            pooled = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+            batches.append(pooled.astype(np.float32))
+
+        if not batches:
+            return _empty_embeddings()
+        return np.concatenate(batches)
+
+
 class EmbeddingEngine:
-    """Generates embeddings using local sentence-transformers or an API fallback."""
+    """Generates embeddings using a local model (ONNX Runtime / sentence-transformers) or an API fallback."""
 
     def __init__(self) -> None:
         self._model = None
         self._use_local = settings.embedding.use_local
+        self._load_lock = threading.Lock()
 
     def _load_local_model(self) -> None:
-        """Lazy-load the local sentence-transformers model."""
+        """Lazy-load the local embedding model (ONNX Runtime first, then sentence-transformers)."""
         if self._model is not None:
             return
+        with self._load_lock:
+            if self._model is None and self._use_local:
+                self._load_local_model_locked()
+
+    def _load_local_model_locked(self) -> None:
+        """Load the model; caller holds _load_lock so concurrent first calls load it once."""
+        if settings.embedding.local_backend == "onnx" and self._load_onnx_model():
+            return
 
         try:
             # Set HuggingFace mirror for China mainland
             os.environ["HF_ENDPOINT"] = HF_MIRROR_URL
 
+            import torch
             from sentence_transformers import SentenceTransformer
             model_name = settings.embedding.local_model_name
-            logger.info(f"Loading embedding model: {model_name} (mirror: {HF_MIRROR_URL})")
-            self._model = SentenceTransformer(model_name)
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            if device == "cpu":
+                torch.set_num_threads(os.cpu_count() or 1)
+            logger.info(f"Loading embedding model: {model_name} on {device} (mirror: {HF_MIRROR_URL})")
+            self._model = SentenceTransformer(model_name, device=device)
             logger.info("Embedding model loaded successfully.")
         except Exception as e:
             logger.error(f"Failed to load local embedding model: {e}")
             self._use_local = False
 
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts."""
+    def _load_onnx_model(self) -> bool:
+        """Try to load the exported ONNX model. Returns False to fall back to PyTorch."""
+        if not (ONNX_MODEL_DIR / "tokenizer.json").exists():
+            logger.info(f"No ONNX embedding model at {ONNX_MODEL_DIR}, using sentence-transformers.")
+            return False
+        try:
+            self._model = OnnxEmbeddingModel(ONNX_MODEL_DIR)
+            logger.info(f"ONNX embedding model loaded from {ONNX_MODEL_DIR}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to load ONNX embedding model, falling back: {e}")
+            return False
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for a list of texts.
+        Returns a float32 array of shape (len(texts), d) with unit-length rows,
+        or an empty array on failure.
+        """
         if self._use_local:
             return self._embed_local(texts)
         else:
             return self._embed_api(texts)
 
-    def _embed_local(self, texts: List[str]) -> List[List[float]]:
-        """Use local sentence-transformers model."""
+    def _embed_local(self, texts: List[str]) -> np.ndarray:
+        """Use the local embedding model."""
         self._load_local_model()
         if self._model is None:
-            return [[] for _ in texts]
+            return _empty_embeddings()
 
         try:
-            embeddings = self._model.encode(texts, show_progress_bar=False)
-            return [emb.tolist() for emb in embeddings]
+            embeddings = self._model.encode(
+                texts,
+                batch_size=EMBED_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+            return np.ascontiguousarray(embeddings, dtype=np.float32)
         except Exception as e:
             logger.error(f"Local embedding failed: {e}")
-            return [[] for _ in texts]
+            return _empty_embeddings()
 
-    def _embed_api(self, texts: List[str]) -> List[List[float]]:
-        """Fallback: use API-based embedding."""
+    def _embed_api(self, texts: List[str]) -> np.ndarray:
+        """Fallback: use API-based embedding (sub-batches are posted concurrently)."""
+        if not texts:
+            return _empty_embeddings()
         try:
-            import httpx
-            cfg = settings.embedding
-            headers = {
-                "Authorization": f"Bearer {cfg.api_key}",
-                "Content-Type": "application/json",
-            }
-            payload = {
-                "model": "BAAI/bge-small-zh-v1.5",
-                "input": texts,
-            }
-            with httpx.Client(timeout=30.0) as client:
-                resp = client.post(
-                    f"{cfg.api_base_url}/embeddings",
-                    headers=headers,
-                    json=payload,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                return [item["embedding"] for item in data["data"]]
+            # Called from worker threads, which have no running event loop
+            return asyncio.run(self._embed_api_async(texts))
         except Exception as e:
             logger.error(f"API embedding failed: {e}")
-            return [[] for _ in texts]
+            return _empty_embeddings()
+
+    async def _embed_api_async(self, texts: List[str]) -> np.ndarray:
+        """Post texts in sub-batches over one pooled AsyncClient and stitch the results in order."""
+        import httpx
+        cfg = settings.embedding
+        headers = {
+            "Authorization": f"Bearer {cfg.api_key}",
+            "Content-Type": "application/json",
+        }
+        url = f"{cfg.api_base_url}/embeddings"
+        semaphore = asyncio.Semaphore(API_EMBED_CONCURRENCY)
+
+        async with httpx.AsyncClient(
+            timeout=30.0,
+            headers=headers,
+            limits=httpx.Limits(max_connections=API_EMBED_CONCURRENCY),
+        ) as client:
+
+            async def post_batch(batch: List[str]) -> List[List[float]]:
+                async with semaphore:
+                    resp = await client.post(url, json={"model": "BAAI/bge-small-zh-v1.5", "input": batch})
+                    resp.raise_for_status()
+                    items = resp.json()["data"]
+                # Items carry their input position; don't rely on response order
+                items.sort(key=lambda item: item.get("index", 0))
+                return [item["embedding"] for item in items]
+
+            batches = [texts[i:i + API_EMBED_BATCH_SIZE] for i in range(0, len(texts), API_EMBED_BATCH_SIZE)]
+            results = await asyncio.gather(*(post_batch(batch) for batch in batches))
+
+        embeddings = np.asarray([vec for batch in results for vec in batch], dtype=np.float32)
+        return _l2_normalize(embeddings)
+
+
+# --- Shared Instance ---
+_embed_engine: Optional[EmbeddingEngine] = None
+_embed_engine_lock = threading.Lock()
+
+
+def get_embed_engine() -> EmbeddingEngine:
+    """Return the process-wide EmbeddingEngine; the model itself loads on first use."""
+    global _embed_engine
+    with _embed_engine_lock:
+        if _embed_engine is None:
+            _embed_engine = EmbeddingEngine()
+        return _embed_engine
+
+
+# ---- Vector Search (Cosine Similarity) ----
+
+def build_embedding_matrix(chunks: List[TextChunk]) -> Tuple[List[TextChunk], np.ndarray]:
+    """
+    Expand chunk embeddings into a contiguous (N, d) float32 matrix.
+    Embeddings are L2-normalized before they are quantized and stored, so
+    cosine similarity is a single matmul with no per-row norms.
+    Chunks without a usable embedding are dropped; the returned chunk list
+    is row-aligned with the matrix.
+    """
+    kept: List[TextChunk] = []
+    blobs: List[bytes] = []
+    for chunk in chunks:
+        blob = chunk.embedding_blob
+        if blob and (not blobs or len(blob) == len(blobs[0])):
+            kept.append(chunk)
+            blobs.append(blob)
 
+    if not blobs:
+        return [], np.empty((0, 0), dtype=np.float32)
 
-# ---- Vector Search (Cosine Similarity - MVP) ----
+    return kept, dequantize_embeddings(b"".join(blobs), len(blobs))
 
-def cosine_similarity(vec_a: List[float], vec_b: List[float]) -> float:
-    """Compute cosine similarity between two vectors."""
-    if not vec_a or not vec_b or len(vec_a) != len(vec_b):
-        return 0.0
 
-    dot = sum(a * b for a, b in zip(vec_a, vec_b))
-    norm_a = math.sqrt(sum(a * a for a in vec_a))
-    norm_b = math.sqrt(sum(b * b for b in vec_b))
+# Below this many rows a fused Numba loop beats BLAS matvec dispatch + argpartition
+NUMBA_MAX_ROWS = 512
 
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+_numba_kernel = None
+_numba_checked = False
+
+
+def _get_numba_kernel():
+    """Compile (or load from Numba's on-disk cache) the small-N top-k kernel; None without numba."""
+    global _numba_kernel, _numba_checked
+    if _numba_checked:
+        return _numba_kernel
+    _numba_checked = True
+    try:
+        from numba import njit
+    except ImportError:
+        logger.debug("numba not installed, small-N top-k uses NumPy.")
+        return None
+
+    @njit(cache=True, fastmath=True)
+    def _topk_dot(matrix, query, k):
+        n, d = matrix.shape
+        best_idx = np.zeros(k, dtype=np.int64)
+        best_score = np.full(k, -np.inf, dtype=np.float32)
+        for i in range(n):
+            acc = np.float32(0.0)
+            for j in range(d):
+                acc += matrix[i, j] * query[j]
+            if acc > best_score[k - 1]:
+                # Insertion into the sorted k-best list (k is tiny)
+                pos = k - 1
+                while pos > 0 and best_score[pos - 1] < acc:
+                    best_score[pos] = best_score[pos - 1]
+                    best_idx[pos] = best_idx[pos - 1]
+                    pos -= 1
+                best_score[pos] = acc
+                best_idx[pos] = i
+        return best_idx, best_score
+
+    _numba_kernel = _topk_dot
+    return _numba_kernel
+
+
+def warm_top_k_kernel() -> None:
+    """Import numba and compile the top-k kernel off the UI path (PrewarmWorker); no-op without numba."""
+    kernel = _get_numba_kernel()
+    if kernel is not None:
+        kernel(np.zeros((2, 4), dtype=np.float32), np.zeros(4, dtype=np.float32), 1)
+
+
+def top_k_rows(query_embedding: np.ndarray, matrix: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score every row of `matrix` against a (unit-length) query.
+    Returns (row indices, scores) of the top-k rows, sorted by score desc.
+    """
+    query = np.asarray(query_embedding, dtype=np.float32).ravel()
+    if matrix.size == 0 or top_k <= 0 or query.shape[0] != matrix.shape[1]:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+
+    n = matrix.shape[0]
+    k = min(top_k, n)
+    if n < NUMBA_MAX_ROWS and matrix.dtype == np.float32 and matrix.flags.c_contiguous:
+        kernel = _get_numba_kernel()
+        if kernel is not None:
+            return kernel(matrix, query, k)
+
+    scores = matrix @ query
+    # O(N) selection of the k best, then sort only those k
+    idx = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(k)
+    idx = idx[np.argsort(-scores[idx])]
+    return idx, scores[idx]
 
 
 def search_similar_chunks(
-    query_embedding: List[float],
+    query_embedding: np.ndarray,
     chunks: List[TextChunk],
     top_k: int = 5,
+    matrix: Optional[np.ndarray] = None,
 ) -> List[Tuple[TextChunk, float]]:
     """
-    Find the top-k most similar chunks to a query embedding.
+    Find the top-k most similar chunks to a (unit-length) query embedding.
+    If `matrix` is given it must come from build_embedding_matrix(chunks);
+    otherwise it is built on the fly.
     Returns list of (chunk, similarity_score) tuples, sorted by score desc.
     """
-    results: List[Tuple[TextChunk, float]] = []
+    if matrix is None:
+        chunks, matrix = build_embedding_matrix(chunks)
+    idx, scores = top_k_rows(query_embedding, matrix, top_k)
+    return [(chunks[i], float(score)) for i, score in zip(idx, scores)]
 
-    for chunk in chunks:
-        if not chunk.embedding_json:
-            continue
-        try:
-            chunk_emb = json.loads(chunk.embedding_json)
-        except json.JSONDecodeError:
-            continue
 
-        score = cosine_similarity(query_embedding, chunk_emb)
-        results.append((chunk, score))
+# ---- High-Level Pipeline ----
 
-    results.sort(key=lambda x: x[1], reverse=True)
-    return results[:top_k]
+# Same-page chunks at least this similar are treated as duplicates
+DEDUP_SIMILARITY = 0.97
 
 
-# ---- High-Level Pipeline ----
+def _dedupe_chunks(chunks: List[TextChunk], embeddings: np.ndarray) -> Tuple[List[TextChunk], np.ndarray]:
+    """
+    Drop near-duplicate chunks (cosine > DEDUP_SIMILARITY) within each page, keeping
+    the longer of each pair. Chunks are emitted page by page, so each page is one
+    contiguous block and only its small Gram matrix is computed.
+    """
+    keep = np.ones(len(chunks), dtype=bool)
+    start = 0
+    while start < len(chunks):
+        end = start
+        while end < len(chunks) and chunks[end].page_start == chunks[start].page_start:
+            end += 1
+        if end - start > 1:
+            block = embeddings[start:end]
+            rows, cols = np.nonzero(np.triu(block @ block.T, k=1) > DEDUP_SIMILARITY)
+            for a, b in zip(rows + start, cols + start):
+                if keep[a] and keep[b]:
+                    keep[a if len(chunks[a].text) < len(chunks[b].text) else b] = False
+        start = end
+
+    if keep.all():
+        return chunks, embeddings
+    kept = [c for c, k in zip(chunks, keep) if k]
+    for i, chunk in enumerate(kept):
+        chunk.chunk_index = i
+    logger.info(f"Dropped {len(chunks) - len(kept)} near-duplicate chunks.")
+    return kept, embeddings[keep]
+
 
 def index_paper(file_path: str) -> List[TextChunk]:
     """
@@ -222,12 +464,15 @@ def index_paper(file_path: str) -> List[TextChunk]:
         return []
 
     # Generate embeddings
-    engine = EmbeddingEngine()
+    engine = get_embed_engine()
     texts = [c.text for c in chunks]
     embeddings = engine.embed_texts(texts)
 
-    for chunk, emb in zip(chunks, embeddings):
-        chunk.embedding_json = json.dumps(emb) if emb else ""
+    # Rows are already unit-length, so stored vectors need no normalization at query time
+    if len(embeddings) == len(chunks):
+        chunks, embeddings = _dedupe_chunks(chunks, embeddings)
+        for chunk, blob in zip(chunks, quantize_embeddings(embeddings)):
+            chunk.embedding_blob = blob
 
     logger.info(f"Paper indexed: {len(chunks)} chunks with embeddings.")
     return chunks
@@ -0,0 +1,115 @@
+"""
+PaperMiner - Semantic Response Cache
+Reuses LLM answers for near-duplicate questions:
+  - Keys are L2-normalized query embeddings, matched by inner product
+  - A hit requires similarity >= tau within the same retrieval scope
+  - Entries expire after a TTL; the oldest are evicted past a size cap
+"""
+
+import logging
+import threading
+import time
+from typing import Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_CACHE_MAX_ENTRIES = 256
+
+
+class SemanticCache:
+    """
+    In-memory cache of (query embedding -> response).
+    Brute-force inner product over at most a few hundred rows is a single
+    matvec, so no ANN structure is needed here.
+    """
+
+    def __init__(self, tau: Optional[float] = None, ttl: Optional[float] = None,
+                 max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES) -> None:
+        self.tau = settings.semantic_cache_tau if tau is None else tau
+        self.ttl = settings.semantic_cache_ttl if ttl is None else ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._keys: Optional[np.ndarray] = None                 # (n, d) normalized query embeddings
+        self._entries: List[Tuple[Hashable, str, float]] = []   # (scope, response, timestamp)
+
+    def lookup(self, query_embedding: np.ndarray, scope: Hashable) -> Optional[str]:
+        """Return a cached response for a semantically equivalent query in `scope`, if any."""
+        query = self._normalize(query_embedding)
+        if query is None:
+            return None
+
+        with self._lock:
+            self._expire()
+            if self._keys is None or self._keys.shape[1] != query.shape[0]:
+                return None
+            scores = self._keys @ query
+            for i in np.argsort(-scores):
+                if scores[i] < self.tau:
+                    break
+                entry_scope, response, _ = self._entries[i]
+                if entry_scope == scope:
+                    logger.info(f"Semantic cache hit (similarity {scores[i]:.3f})")
+                    return response
+        return None
+
+    def add(self, query_embedding: np.ndarray, scope: Hashable, response: str) -> None:
+        """Cache a response for a query embedding."""
+        query = self._normalize(query_embedding)
+        if query is None:
+            return
+
+        with self._lock:
+            if self._keys is None or self._keys.shape[1] != query.shape[0]:
+                self._keys = np.empty((0, query.shape[0]), dtype=np.float32)
+                self._entries = []
+            self._keys = np.vstack([self._keys, query[None, :]])
+            self._entries.append((scope, response, time.monotonic()))
+
+            overflow = len(self._entries) - self.max_entries
+            if overflow > 0:
+                self._keys = self._keys[overflow:]
+                self._entries = self._entries[overflow:]
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._keys = None
+            self._entries = []
+
+    # ---- Internal Methods ----
+
+    def _expire(self) -> None:
+        """Drop entries older than the TTL (entries are kept in insertion order)."""
+        cutoff = time.monotonic() - self.ttl
+        expired = 0
+        while expired < len(self._entries) and self._entries[expired][2] < cutoff:
+            expired += 1
+        if expired:
+            self._keys = self._keys[expired:]
+            self._entries = self._entries[expired:]
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> Optional[np.ndarray]:
+        vec = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        if vec.size == 0 or norm == 0:
+            return None
+        return vec / norm
+
+
+# --- Shared Instance ---
+_semantic_cache: Optional[SemanticCache] = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Return the process-wide SemanticCache, creating it on first use."""
+    global _semantic_cache
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            _semantic_cache = SemanticCache()
+        return _semantic_cache
@@ -0,0 +1,231 @@
+"""
+PaperMiner - Library Vector Index
+Approximate nearest-neighbour search over every chunk in the library:
+  - HNSW graph (via hnswlib) persisted next to library.db
+  - Rebuilt automatically when the indexed chunks change
+  - Brute-force NumPy fallback when hnswlib is not installed, over an
+    embedding matrix memory-mapped from library.emb.f32
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import EMBEDDING_MATRIX_PATH, HNSW_INDEX_PATH
+from core.database import DatabaseManager
+from core.models import TextChunk
+from ai.rag_engine import top_k_rows
+
+logger = logging.getLogger(__name__)
+
+# HNSW build/search parameters
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+# Stored embeddings are unit-length, so inner product equals cosine similarity
+HNSW_SPACE = "ip"
+
+
+class LibraryIndex:
+    """
+    Library-wide vector index over all embedded text chunks.
+    Shared between ChatHandler instances; safe to use from worker threads.
+    """
+
+    def __init__(self, index_path: Path = HNSW_INDEX_PATH,
+                 matrix_path: Path = EMBEDDING_MATRIX_PATH) -> None:
+        self.index_path = Path(index_path)
+        self.meta_path = self.index_path.with_suffix(self.index_path.suffix + ".json")
+        self.matrix_path = Path(matrix_path)
+        self.matrix_ids_path = self.matrix_path.with_suffix(".ids")
+        self.matrix_meta_path = self.matrix_path.with_suffix(self.matrix_path.suffix + ".json")
+        self._lock = threading.Lock()
+        self._index = None                                  # hnswlib.Index
+        self._signature: Optional[Tuple[int, int]] = None   # (count, max_id) the index was built from
+        self._db_version: Optional[Tuple[int, int]] = None  # (id(db), db.chunks_version) last checked
+        self._dim = 0
+        # NumPy fallback state (hnswlib unavailable): row-aligned chunk ids and embeddings
+        self._ids: Optional[np.ndarray] = None
+        self._matrix: Optional[np.ndarray] = None
+
+        try:
+            import hnswlib  # noqa: F401
+            self._use_hnsw = True
+        except ImportError:
+            logger.warning("hnswlib not installed, library search falls back to brute force. "
+                           "Run: pip install hnswlib")
+            self._use_hnsw = False
+
+    def refresh(self, db: DatabaseManager) -> int:
+        """Bring the index up to date with the database. Returns the number of indexed chunks."""
+        with self._lock:
+            self._ensure_fresh(db)
+            return self._signature[0] if self._signature else 0
+
+    def search(self, db: DatabaseManager, query_embedding: np.ndarray,
+               top_k: int = 5) -> List[Tuple[TextChunk, float]]:
+        """Return the top-k (chunk, cosine score) pairs across the library."""
+        with self._lock:
+            self._ensure_fresh(db)
+            ids, scores = self._top_k(query_embedding, top_k)
+
+        # Only the winners' text is loaded from SQLite
+        by_id = {c.id: c for c in db.get_chunks_by_ids(ids)}
+        return [(by_id[i], score) for i, score in zip(ids, scores) if i in by_id]
+
+    # ---- Internal Methods ----
+
+    def _top_k(self, query_embedding: np.ndarray, top_k: int) -> Tuple[List[int], List[float]]:
+        """Return the ids and similarity scores of the top-k chunks (caller holds the lock)."""
+        if not self._use_hnsw:
+            if self._matrix is None:
+                return [], []
+            rows, scores = top_k_rows(query_embedding, self._matrix, top_k)
+            return self._ids[rows].tolist(), scores.tolist()
+
+        if self._index is None:
+            return [], []
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        if query.shape[1] != self._dim:
+            return [], []
+        k = min(top_k, self._index.get_current_count())
+        if k <= 0:
+            return [], []
+        labels, distances = self._index.knn_query(query, k=k)
+        # hnswlib's ip space returns distance = 1 - inner product
+        return [int(i) for i in labels[0]], [1.0 - float(d) for d in distances[0]]
+
+    def _ensure_fresh(self, db: DatabaseManager) -> None:
+        """Load the persisted index, rebuilding it if the library has changed."""
+        db_version = (id(db), db.chunks_version)
+        if db_version == self._db_version:
+            return  # no chunk writes through this connection since the last check
+        self._db_version = db_version
+
+        signature = db.get_chunks_signature()
+        if signature == self._signature:
+            return
+
+        if self._use_hnsw:
+            if self._load(signature):
+                return
+        elif self._load_matrix(signature):
+            return
+        self._rebuild(db, signature)
+
+    def _load(self, signature: Tuple[int, int]) -> bool:
+        """Load the on-disk index if it was built from the current chunk set."""
+        if not self.index_path.exists() or not self.meta_path.exists():
+            return False
+        try:
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            if tuple(meta["signature"]) != signature or meta.get("space") != HNSW_SPACE:
+                return False
+
+            import hnswlib
+            index = hnswlib.Index(space=HNSW_SPACE, dim=meta["dim"])
+            index.load_index(str(self.index_path), max_elements=signature[0])
+            index.set_ef(HNSW_EF_SEARCH)
+        except Exception as e:
+            logger.warning(f"Failed to load HNSW index, rebuilding: {e}")
+            return False
+
+        self._index = index
+        self._dim = meta["dim"]
+        self._signature = signature
+        logger.info(f"Loaded HNSW index with {signature[0]} chunks from {self.index_path}")
+        return True
+
+    def _rebuild(self, db: DatabaseManager, signature: Tuple[int, int]) -> None:
+        """Build the index from every embedded chunk in the database."""
+        ids, matrix = db.get_all_embeddings()
+        self._signature = signature
+        self._index = None
+        self._ids, self._matrix = None, None
+
+        if not len(ids):
+            self._dim = 0
+            return
+        self._dim = matrix.shape[1]
+
+        if not self._use_hnsw:
+            self._ids, self._matrix = ids, matrix
+            self._save_matrix(signature)
+            return
+
+        import hnswlib
+        index = hnswlib.Index(space=HNSW_SPACE, dim=self._dim)
+        index.init_index(max_elements=len(ids), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        index.add_items(matrix, ids)
+        index.set_ef(HNSW_EF_SEARCH)
+        self._index = index
+
+        try:
+            index.save_index(str(self.index_path))
+            self.meta_path.write_text(
+                json.dumps({"signature": list(signature), "dim": self._dim, "space": HNSW_SPACE}),
+                encoding="utf-8",
+            )
+        except OSError as e:
+            logger.warning(f"Failed to persist HNSW index: {e}")
+        logger.info(f"Built HNSW index over {len(ids)} chunks.")
+
+    def _load_matrix(self, signature: Tuple[int, int]) -> bool:
+        """Memory-map the on-disk embedding matrix if it was built from the current chunk set."""
+        paths = (self.matrix_path, self.matrix_ids_path, self.matrix_meta_path)
+        if not all(p.exists() for p in paths):
+            return False
+        try:
+            meta = json.loads(self.matrix_meta_path.read_text(encoding="utf-8"))
+            n, dim = meta["shape"]
+            if tuple(meta["signature"]) != signature or n == 0:
+                return False
+            # Pages are read on demand; nothing is parsed from SQLite
+            ids = np.memmap(self.matrix_ids_path, dtype=np.int64, mode="r", shape=(n,))
+            matrix = np.memmap(self.matrix_path, dtype=np.float32, mode="r", shape=(n, dim))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Failed to map embedding matrix, rebuilding: {e}")
+            return False
+
+        self._ids, self._matrix = ids, matrix
+        self._dim = dim
+        self._signature = signature
+        logger.info(f"Mapped embedding matrix with {n} chunks from {self.matrix_path}")
+        return True
+
+    def _save_matrix(self, signature: Tuple[int, int]) -> None:
+        """Write ids and embeddings as flat files so the next start can memory-map them."""
+        n, dim = self._matrix.shape
+        try:
+            self.matrix_meta_path.unlink(missing_ok=True)  # never pair old metadata with partial data
+            out = np.memmap(self.matrix_ids_path, dtype=np.int64, mode="w+", shape=(n,))
+            out[:] = self._ids
+            out.flush()
+            out = np.memmap(self.matrix_path, dtype=np.float32, mode="w+", shape=(n, dim))
+            out[:] = self._matrix
+            out.flush()
+            del out
+            self.matrix_meta_path.write_text(
+                json.dumps({"signature": list(signature), "shape": [n, dim]}),
+                encoding="utf-8",
+            )
+        except OSError as e:
+            logger.warning(f"Failed to persist embedding matrix: {e}")
+
+
+# --- Shared Instance ---
+_library_index: Optional[LibraryIndex] = None
+_library_index_lock = threading.Lock()
+
+
+def get_library_index() -> LibraryIndex:
+    """Return the process-wide LibraryIndex, creating it on first use."""
+    global _library_index
+    with _library_index_lock:
+        if _library_index is None:
+            _library_index = LibraryIndex()
+        return _library_index
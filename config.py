@@ -14,10 +14,14 @@ from typing import Optional
 APP_ROOT = Path(__file__).parent.resolve()
 LIBRARY_DIR = APP_ROOT / "paper_library"
 DB_PATH = APP_ROOT / "library.db"
+HNSW_INDEX_PATH = APP_ROOT / "library.hnsw"
+EMBEDDING_MATRIX_PATH = APP_ROOT / "library.emb.f32"
+HTTP_CACHE_PATH = APP_ROOT / "http_cache.db"
 PDFJS_DIR = APP_ROOT / "pdfjs-5.4.624-dist"
 PDFJS_VIEWER_URL = PDFJS_DIR / "web" / "viewer.html"
 RESOURCES_DIR = APP_ROOT / "resources"
 CONFIG_FILE = APP_ROOT / "settings.json"
+ONNX_MODEL_DIR = APP_ROOT / "models" / "all-MiniLM-L6-v2-onnx-int8"
 
 # HuggingFace mirror for China mainland
 HF_MIRROR_URL = "https://hf-mirror.com"
@@ -42,22 +46,37 @@ class LLMConfig:
 class EmbeddingConfig:
     """Configuration for embedding model (local or API)."""
     use_local: bool = True
+    local_backend: str = "onnx"         # onnx | sentence_transformers (onnx falls back if not exported)
     local_model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
     api_provider: str = "siliconflow"   # fallback to API if local fails
     api_key: str = ""
     api_base_url: str = "https://api.siliconflow.cn/v1"
 
 
+@dataclass
+class DatabaseConfig:
+    """SQLite connection PRAGMAs applied on connect."""
+    synchronous: str = "NORMAL"         # NORMAL is durable under WAL except on power loss
+    cache_size_kb: int = 64000          # page cache per connection
+    temp_store: str = "MEMORY"
+    mmap_size: int = 2147483648         # bytes; set 0 to disable memory-mapped I/O
+    busy_timeout_ms: int = 5000
+    wal_autocheckpoint: int = 1000      # pages
+
+
 @dataclass
 class AppSettings:
     """Top-level application settings, serializable to JSON."""
     llm: LLMConfig = field(default_factory=LLMConfig)
     embedding: EmbeddingConfig = field(default_factory=EmbeddingConfig)
+    database: DatabaseConfig = field(default_factory=DatabaseConfig)
     theme: str = "dark"                 # dark | light
     language: str = "zh"                # zh | en
     chunk_size: int = 512
     chunk_overlap: int = 64
     top_k_retrieval: int = 5
+    semantic_cache_tau: float = 0.95    # min cosine similarity to reuse a cached answer
+    semantic_cache_ttl: int = 3600      # seconds
 
     def save(self, path: Optional[Path] = None) -> None:
         """Persist settings to a JSON file."""
@@ -79,11 +98,14 @@ class AppSettings:
             return cls(
                 llm=LLMConfig(**data.get("llm", {})),
                 embedding=EmbeddingConfig(**data.get("embedding", {})),
+                database=DatabaseConfig(**data.get("database", {})),
                 theme=data.get("theme", "dark"),
                 language=data.get("language", "zh"),
                 chunk_size=data.get("chunk_size", 512),
                 chunk_overlap=data.get("chunk_overlap", 64),
                 top_k_retrieval=data.get("top_k_retrieval", 5),
+                semantic_cache_tau=data.get("semantic_cache_tau", 0.95),
+                semantic_cache_ttl=data.get("semantic_cache_ttl", 3600),
             )
         except (json.JSONDecodeError, TypeError):
             return cls()
@@ -96,6 +118,10 @@ settings = AppSettings.load()
 def get_env_flags() -> dict:
     """Return Chromium/Qt environment flags for stable PDF rendering on Win11."""
     return {
-        "QTWEBENGINE_CHROMIUM_FLAGS": "--disable-gpu --allow-file-access-from-files --no-sandbox",
+        "QTWEBENGINE_CHROMIUM_FLAGS": (
+            "--disable-gpu --allow-file-access-from-files --no-sandbox"
+            " --disable-features=Translate,MediaRouter,OptimizationHints"
+            " --renderer-process-limit=1"
+        ),
         "QTWEBENGINE_DISABLE_SANDBOX": "1",
     }
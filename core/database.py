@@ -3,31 +3,193 @@ PaperMiner - Database Manager
 Handles all SQLite operations: folders, papers, annotations, notes, and text chunks.
 """
 
+import json
 import sqlite3
 import logging
-from datetime import datetime
+import math
+import threading
+from array import array
+from contextlib import contextmanager
+from itertools import starmap
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 
+from config import settings, DatabaseConfig
 from core.models import Folder, Paper, Annotation, Note, TextChunk
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Timestamps come from SQLite's clock ("YYYY-MM-DD HH:MM:SS", local time) rather than
+# a Python strftime per write. Spelled out in the statements as well as the column
+# DEFAULTs because tables created by older versions have no defaults.
+_NOW = "datetime('now', 'localtime')"
+
+# PRAGMA user_version once embedding BLOBs are int8 + scale instead of float32
+EMBEDDING_FORMAT_VERSION = 1
+
+# Write statements as shared constants: passing the identical string every call
+# lets sqlite3's per-connection statement cache skip re-parsing and re-planning.
+# INSERT heads and per-row VALUES tuples are kept apart so bulk inserts can put many
+# rows into one statement; RETURNING id (SQLite >= 3.35) hands back the new keys.
+_PAPER_HEAD = (
+    "INSERT INTO papers (title, file_path, folder_id, upload_date, abstract, authors, source_url) VALUES "
+)
+_PAPER_ROW = f"(?, ?, ?, {_NOW}, ?, ?, ?)"
+_INSERT_PAPER = f"{_PAPER_HEAD}{_PAPER_ROW} RETURNING id"
+_ANNOTATION_HEAD = (
+    "INSERT INTO annotations "
+    "(paper_id, page, content, comment, color, rects_json, created_at, updated_at) VALUES "
+)
+_ANNOTATION_ROW = f"(?, ?, ?, ?, ?, ?, {_NOW}, {_NOW})"
+_INSERT_ANNOTATION = f"{_ANNOTATION_HEAD}{_ANNOTATION_ROW} RETURNING id"
+_UPDATE_ANNOTATION_COMMENT = f"UPDATE annotations SET comment = ?, updated_at = {_NOW} WHERE id = ?"
+_UPSERT_NOTE = (
+    f"INSERT INTO notes (paper_id, content, updated_at) VALUES (?, ?, {_NOW}) "
+    "ON CONFLICT(paper_id) DO UPDATE SET content = excluded.content, updated_at = excluded.updated_at"
+)
+_INSERT_CHUNK = (
+    "INSERT INTO text_chunks (paper_id, chunk_index, text, embedding_blob, page_start, page_end) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
 
-class DatabaseManager:
-    """Thread-safe SQLite database manager for PaperMiner."""
 
-    def __init__(self, db_path: str = "library.db") -> None:
+class DatabaseManager:
+    """
+    Thread-safe SQLite database manager for PaperMiner.
+    One writer + N readers: every thread reads through its own connection
+    (WAL lets them run concurrently), while all INSERT/UPDATE/DELETE go
+    through a single write connection serialized by a lock.
+    """
+
+    # Column lists in dataclass field order with NULLs coalesced in SQL, so rows map
+    # positionally (starmap(Paper, rows)) without per-row keyword construction.
+    # Papers are always selected as "papers p" (the FTS join shares column names).
+    _PAPER_COLUMNS = (
+        "p.id, p.title, p.file_path, p.folder_id, p.upload_date, COALESCE(p.abstract, ''), "
+        "COALESCE(p.authors, ''), COALESCE(p.source_url, ''), p.is_indexed != 0"
+    )
+    _ANNOTATION_COLUMNS = (
+        "id, paper_id, page, content, comment, color, rects_json, "
+        "COALESCE(created_at, ''), COALESCE(updated_at, '')"
+    )
+    # Explicit column list: legacy databases still carry the old embedding_json column
+    _CHUNK_COLUMNS = (
+        "id, paper_id, chunk_index, text, COALESCE(embedding_blob, x''), page_start, page_end"
+    )
+    # Same row shape without the vector, for callers that only need text and pages
+    _CHUNK_TEXT_COLUMNS = "id, paper_id, chunk_index, text, x'', page_start, page_end"
+    # Rows pulled per fetchmany() when streaming large result sets
+    FETCH_BATCH = 1000
+    # Rows per multi-row INSERT statement in the bulk helpers
+    BULK_INSERT_ROWS = 500
+
+    def __init__(self, db_path: str = "library.db", config: Optional[DatabaseConfig] = None) -> None:
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.execute("PRAGMA journal_mode=WAL")
-        self.conn.execute("PRAGMA foreign_keys=ON")
-        self.cursor = self.conn.cursor()
+        self._config = config or settings.database
+        self.conn = self._connect()             # the write connection
+        self._write_lock = threading.RLock()
+        self._local = threading.local()         # .conn: this thread's read connection
+        self._readers: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._readers_lock = threading.Lock()
+        self._batch_depth = 0  # > 0 while a batch() block owns the write transaction
+        self._chunks_version = 0  # bumped whenever text_chunks changes
+        self._chunks_dirty = False  # text_chunks changed inside the current batch
         self._create_tables()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection with the PRAGMA baseline applied."""
+        # check_same_thread=False only so close() can shut down other threads' readers
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._apply_pragmas(conn, self._config)
+        return conn
+
+    @staticmethod
+    def _apply_pragmas(conn: sqlite3.Connection, cfg: DatabaseConfig) -> None:
+        """WAL + NORMAL sync, large page cache, in-memory temp sorts, memory-mapped reads."""
+        conn.executescript(f"""
+            PRAGMA journal_mode=WAL;
+            PRAGMA foreign_keys=ON;
+            PRAGMA synchronous={cfg.synchronous};
+            PRAGMA cache_size=-{int(cfg.cache_size_kb)};
+            PRAGMA temp_store={cfg.temp_store};
+            PRAGMA mmap_size={int(cfg.mmap_size)};
+            PRAGMA busy_timeout={int(cfg.busy_timeout_ms)};
+            PRAGMA wal_autocheckpoint={int(cfg.wal_autocheckpoint)};
+        """)
+
+    def _read(self) -> sqlite3.Connection:
+        """Return the calling thread's read connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        conn = self._connect()
+        conn.execute("PRAGMA query_only=ON")
+        self._local.conn = conn
+        with self._readers_lock:
+            # Worker threads come and go; close readers whose thread has exited
+            for ident, (thread, stale) in list(self._readers.items()):
+                if not thread.is_alive():
+                    stale.close()
+                    del self._readers[ident]
+            self._readers[threading.get_ident()] = (threading.current_thread(), conn)
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Serialize writers on the write connection; commits on success, rolls back on error."""
+        with self._write_lock:
+            if self._batch_depth:
+                yield self.conn  # the enclosing batch() commits
+            else:
+                with self.conn:
+                    yield self.conn
+
+    @contextmanager
+    def batch(self) -> Iterator["DatabaseManager"]:
+        """
+        Group writes into a single transaction (one commit / WAL sync instead of one
+        per call), e.g. `with db.batch(): ...` around a burst of annotations.
+        Commits when the outermost block exits and rolls everything back on error.
+        Other threads' writes wait until the block ends; reads are unaffected.
+        """
+        with self._write_lock:
+            self._batch_depth += 1
+            try:
+                if self._batch_depth > 1:
+                    yield self
+                    return
+                with self.conn:
+                    yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._chunks_dirty:
+                    self._chunks_dirty = False
+                    self._chunks_version += 1
+
+    def flush(self) -> None:
+        """Commit pending writes now, e.g. from inside a batch() before a durable checkpoint."""
+        with self._write_lock:
+            self.conn.commit()
+
+    def _bump_chunks_version(self) -> None:
+        """Record a committed text_chunks change (deferred to the end of an open batch)."""
+        if self._batch_depth:
+            self._chunks_dirty = True
+        else:
+            self._chunks_version += 1
+
+    @property
+    def chunks_version(self) -> int:
+        """Monotonic counter of text_chunks mutations, for invalidating RAG caches."""
+        return self._chunks_version
+
     def _create_tables(self) -> None:
         """Create all required tables if they don't exist."""
-        self.cursor.executescript("""
+        self.conn.executescript(f"""
             CREATE TABLE IF NOT EXISTS folders (
                 id   INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL UNIQUE
@@ -38,7 +200,7 @@ class DatabaseManager:
                 title       TEXT NOT NULL,
                 file_path   TEXT NOT NULL,
                 folder_id   INTEGER,
-                upload_date TEXT,
+                upload_date TEXT DEFAULT ({_NOW}),
                 abstract    TEXT DEFAULT '',
                 authors     TEXT DEFAULT '',
                 source_url  TEXT DEFAULT '',
@@ -54,8 +216,8 @@ class DatabaseManager:
                 comment    TEXT DEFAULT '',
                 color      TEXT DEFAULT '#FFFF00',
                 rects_json TEXT DEFAULT '[]',
-                created_at TEXT,
-                updated_at TEXT,
+                created_at TEXT DEFAULT ({_NOW}),
+                updated_at TEXT DEFAULT ({_NOW}),
                 FOREIGN KEY (paper_id) REFERENCES papers(id) ON DELETE CASCADE
             );
 
@@ -63,7 +225,7 @@ class DatabaseManager:
                 id         INTEGER PRIMARY KEY AUTOINCREMENT,
                 paper_id   INTEGER NOT NULL UNIQUE,
                 content    TEXT DEFAULT '',
-                updated_at TEXT,
+                updated_at TEXT DEFAULT ({_NOW}),
                 FOREIGN KEY (paper_id) REFERENCES papers(id) ON DELETE CASCADE
             );
 
@@ -72,206 +234,450 @@ class DatabaseManager:
                 paper_id       INTEGER NOT NULL,
                 chunk_index    INTEGER DEFAULT 0,
                 text           TEXT DEFAULT '',
-                embedding_json TEXT DEFAULT '',
+                embedding_blob BLOB,
                 page_start     INTEGER DEFAULT 0,
                 page_end       INTEGER DEFAULT 0,
                 FOREIGN KEY (paper_id) REFERENCES papers(id) ON DELETE CASCADE
             );
+
+            -- Hot lookups and sorts (also serve the FK cascades on paper/folder delete).
+            -- notes(paper_id) is already indexed by its UNIQUE constraint.
+            CREATE INDEX IF NOT EXISTS idx_papers_folder_date ON papers(folder_id, upload_date DESC);
+            CREATE INDEX IF NOT EXISTS idx_papers_date ON papers(upload_date DESC);
+            -- Holds only the (few) papers still waiting for RAG indexing
+            CREATE INDEX IF NOT EXISTS idx_papers_unindexed ON papers(id) WHERE is_indexed = 0;
+            CREATE INDEX IF NOT EXISTS idx_annotations_paper_page ON annotations(paper_id, page, id);
+            CREATE INDEX IF NOT EXISTS idx_chunks_paper_idx ON text_chunks(paper_id, chunk_index);
         """)
-        self.conn.commit()
+        self._migrate_embeddings_to_blob()
+        self._quantize_float32_embeddings()
+        self._create_fts()
+        # Embedded chunk ids only: the signature check and embedding scan read this small
+        # index instead of walking table pages full of text (SQLite has no INCLUDE columns)
+        with self._write() as conn:
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_chunks_embedded ON text_chunks(id) "
+                "WHERE length(embedding_blob) > 0"
+            )
         logger.info("Database tables initialized.")
 
+    def _migrate_embeddings_to_blob(self) -> None:
+        """One-time migration: convert legacy JSON embeddings into L2-normalized float32 BLOBs."""
+        columns = {r[1] for r in self.conn.execute("PRAGMA table_info(text_chunks)")}
+        if "embedding_json" not in columns:
+            return
+
+        with self._write() as conn:
+            if "embedding_blob" not in columns:
+                conn.execute("ALTER TABLE text_chunks ADD COLUMN embedding_blob BLOB")
+
+            rows = conn.execute(
+                "SELECT id, embedding_json FROM text_chunks WHERE embedding_json != ''"
+            ).fetchall()
+            if not rows:
+                return
+            updates = []
+            for chunk_id, emb_json in rows:
+                try:
+                    vec = json.loads(emb_json)
+                    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+                    blob = array("f", (x / norm for x in vec)).tobytes()
+                except (json.JSONDecodeError, TypeError):
+                    blob = None
+                updates.append((blob, chunk_id))
+            conn.executemany(
+                "UPDATE text_chunks SET embedding_blob = ?, embedding_json = '' WHERE id = ?",
+                updates,
+            )
+        logger.info(f"Migrated {len(updates)} chunk embeddings from JSON to BLOB.")
+
+    def _quantize_float32_embeddings(self) -> None:
+        """
+        One-time migration: rewrite float32 embedding BLOBs in the int8 + scale
+        format (core.quantization). PRAGMA user_version records that it ran.
+        """
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= EMBEDDING_FORMAT_VERSION:
+            return
+
+        rows = self.conn.execute(
+            "SELECT id, embedding_blob FROM text_chunks WHERE length(embedding_blob) > 0"
+        ).fetchall()
+        updates = []
+        if rows:
+            import numpy as np  # kept off the UI start-up path
+            from core.quantization import quantize_embeddings
+
+            for chunk_id, blob in rows:
+                vec = np.frombuffer(blob, dtype=np.float32)[None, :]
+                updates.append((quantize_embeddings(vec)[0], chunk_id))
+
+        with self._write() as conn:
+            conn.executemany("UPDATE text_chunks SET embedding_blob = ? WHERE id = ?", updates)
+            conn.execute(f"PRAGMA user_version = {EMBEDDING_FORMAT_VERSION}")
+        if updates:
+            logger.info(f"Quantized {len(updates)} chunk embeddings to int8.")
+
+    def _create_fts(self) -> None:
+        """Create the papers_fts full-text index (external content, kept in sync by triggers)."""
+        existed = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'papers_fts'"
+        ).fetchone() is not None
+        try:
+            self.conn.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+                    title, abstract, authors,
+                    content='papers', content_rowid='id', tokenize='porter unicode61'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS papers_fts_ai AFTER INSERT ON papers BEGIN
+                    INSERT INTO papers_fts(rowid, title, abstract, authors)
+                    VALUES (new.id, new.title, new.abstract, new.authors);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS papers_fts_ad AFTER DELETE ON papers BEGIN
+                    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, authors)
+                    VALUES ('delete', old.id, old.title, old.abstract, old.authors);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS papers_fts_au AFTER UPDATE OF title, abstract, authors ON papers BEGIN
+                    INSERT INTO papers_fts(papers_fts, rowid, title, abstract, authors)
+                    VALUES ('delete', old.id, old.title, old.abstract, old.authors);
+                    INSERT INTO papers_fts(rowid, title, abstract, authors)
+                    VALUES (new.id, new.title, new.abstract, new.authors);
+                END;
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, paper search falls back to LIKE: {e}")
+            self._has_fts = False
+            return
+
+        self._has_fts = True
+        if not existed:
+            # Index papers that were added before the FTS table existed
+            with self._write() as conn:
+                conn.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+
     # ---- Folder Operations ----
 
-    def add_folder(self, name: str) -> bool:
-        """Add a new folder. Returns True on success, False if duplicate."""
+    def add_folder(self, name: str) -> Optional[int]:
+        """Add a new folder. Returns its ID, or None if the name is a duplicate."""
         try:
-            self.cursor.execute("INSERT INTO folders (name) VALUES (?)", (name,))
-            self.conn.commit()
-            return True
+            with self._write() as conn:
+                return conn.execute("INSERT INTO folders (name) VALUES (?)", (name,)).lastrowid
         except sqlite3.IntegrityError:
-            return False
+            return None
 
     def get_folders(self) -> List[Folder]:
         """Return all folders."""
-        self.cursor.execute("SELECT id, name FROM folders ORDER BY name")
-        return [Folder(id=r[0], name=r[1]) for r in self.cursor.fetchall()]
+        rows = self._read().execute("SELECT id, name FROM folders ORDER BY name").fetchall()
+        return [Folder(id=r[0], name=r[1]) for r in rows]
+
+    def get_folder_counts(self) -> Dict[int, int]:
+        """Paper count per folder id, from a single GROUP BY (unfiled papers are skipped)."""
+        rows = self._read().execute(
+            "SELECT folder_id, COUNT(*) FROM papers WHERE folder_id IS NOT NULL GROUP BY folder_id"
+        ).fetchall()
+        return dict(rows)
 
     def rename_folder(self, folder_id: int, new_name: str) -> bool:
         """Rename a folder."""
         try:
-            self.cursor.execute("UPDATE folders SET name = ? WHERE id = ?", (new_name, folder_id))
-            self.conn.commit()
+            with self._write() as conn:
+                conn.execute("UPDATE folders SET name = ? WHERE id = ?", (new_name, folder_id))
             return True
         except sqlite3.IntegrityError:
             return False
 
     def delete_folder(self, folder_id: int) -> None:
         """Delete a folder (papers are kept with NULL folder_id)."""
-        self.cursor.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
-        self.conn.commit()
+        with self._write() as conn:
+            conn.execute("DELETE FROM folders WHERE id = ?", (folder_id,))
 
     # ---- Paper Operations ----
 
     def add_paper(self, title: str, file_path: str, folder_id: int,
                   abstract: str = "", authors: str = "", source_url: str = "") -> int:
         """Add a paper and return its new ID."""
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.cursor.execute(
-            """INSERT INTO papers (title, file_path, folder_id, upload_date,
-               abstract, authors, source_url) VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (title, file_path, folder_id, now, abstract, authors, source_url),
-        )
-        self.conn.commit()
-        return self.cursor.lastrowid  # type: ignore
-
-    def get_papers_by_folder(self, folder_id: Optional[int] = None) -> List[Paper]:
-        """Return papers in a folder, or all papers if folder_id is None."""
+        with self._write() as conn:
+            return conn.execute(
+                _INSERT_PAPER, (title, file_path, folder_id, abstract, authors, source_url)
+            ).fetchone()[0]
+
+    def add_papers_bulk(self, rows: List[Tuple[str, str, Optional[int], str, str, str]]) -> List[int]:
+        """
+        Add many papers in one transaction and return their IDs in row order.
+        Each row is (title, file_path, folder_id, abstract, authors, source_url).
+        """
+        with self._write() as conn:
+            return self._insert_many(conn, _PAPER_HEAD, _PAPER_ROW, rows)
+
+    def get_papers_by_folder(
+        self, folder_id: Optional[int] = None, limit: int = -1, offset: int = 0
+    ) -> List[Paper]:
+        """Return papers in a folder (all papers if folder_id is None), newest first.
+
+        limit/offset page through the result; the default limit of -1 returns every row.
+        """
+        conn = self._read()
         if folder_id is None:
-            self.cursor.execute("SELECT * FROM papers ORDER BY upload_date DESC")
+            cur = conn.execute(
+                f"SELECT {self._PAPER_COLUMNS} FROM papers p ORDER BY p.upload_date DESC "
+                "LIMIT ? OFFSET ?",
+                (limit, offset),
+            )
         else:
-            self.cursor.execute(
-                "SELECT * FROM papers WHERE folder_id = ? ORDER BY upload_date DESC",
-                (folder_id,),
+            cur = conn.execute(
+                f"SELECT {self._PAPER_COLUMNS} FROM papers p WHERE p.folder_id = ? "
+                "ORDER BY p.upload_date DESC LIMIT ? OFFSET ?",
+                (folder_id, limit, offset),
             )
-        return [self._row_to_paper(r) for r in self.cursor.fetchall()]
+        return list(starmap(Paper, cur.fetchall()))
+
+    def count_papers(self, folder_id: Optional[int] = None) -> int:
+        """Number of papers in a folder, or in the whole library if folder_id is None."""
+        conn = self._read()
+        if folder_id is None:
+            return conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+        return conn.execute(
+            "SELECT COUNT(*) FROM papers WHERE folder_id = ?", (folder_id,)
+        ).fetchone()[0]
+
+    def get_paper_titles(self) -> List[str]:
+        """All paper titles, alphabetically (for search completion)."""
+        rows = self._read().execute("SELECT title FROM papers ORDER BY title").fetchall()
+        return [r[0] for r in rows]
 
     def search_papers(self, keyword: str) -> List[Paper]:
-        """Full-text keyword search on title, abstract, and authors."""
+        """Full-text keyword search on title, abstract, and authors (prefix match, best first)."""
+        terms = keyword.split()
+        if not terms:
+            # An empty pattern matches everything; skip the text scan entirely
+            return self.get_papers_by_folder(None)
+        # unicode61 does not segment CJK text, so substring search needs LIKE there
+        if not self._has_fts or not keyword.isascii():
+            return self._search_papers_like(keyword.strip())
+
+        # Quote each term so FTS5 syntax characters in user input are literal; AND them together
+        query = " ".join('"' + t.replace('"', '""') + '"*' for t in terms)
+        rows = self._read().execute(
+            f"SELECT {self._PAPER_COLUMNS} FROM papers p JOIN papers_fts f ON f.rowid = p.id "
+            "WHERE papers_fts MATCH ? ORDER BY f.rank",
+            (query,),
+        ).fetchall()
+        return list(starmap(Paper, rows))
+
+    def _search_papers_like(self, keyword: str) -> List[Paper]:
+        """Substring search fallback for non-ASCII keywords or builds without FTS5."""
         q = f"%{keyword}%"
-        self.cursor.execute(
-            "SELECT * FROM papers WHERE title LIKE ? OR abstract LIKE ? OR authors LIKE ?",
+        rows = self._read().execute(
+            f"SELECT {self._PAPER_COLUMNS} FROM papers p "
+            "WHERE p.title LIKE ? OR p.abstract LIKE ? OR p.authors LIKE ?",
             (q, q, q),
-        )
-        return [self._row_to_paper(r) for r in self.cursor.fetchall()]
+        ).fetchall()
+        return list(starmap(Paper, rows))
 
     def delete_paper(self, paper_id: int) -> None:
         """Delete a paper and its associated data (cascade)."""
-        self.cursor.execute("DELETE FROM papers WHERE id = ?", (paper_id,))
-        self.conn.commit()
+        with self._write() as conn:
+            conn.execute("DELETE FROM papers WHERE id = ?", (paper_id,))
+        self._bump_chunks_version()
+
+    def get_unindexed_papers(self) -> List[Paper]:
+        """Return papers whose chunks have not been embedded yet, oldest first."""
+        rows = self._read().execute(
+            f"SELECT {self._PAPER_COLUMNS} FROM papers p WHERE p.is_indexed = 0 ORDER BY p.id"
+        ).fetchall()
+        return list(starmap(Paper, rows))
 
     def set_paper_indexed(self, paper_id: int, indexed: bool = True) -> None:
         """Mark a paper as indexed (embeddings generated)."""
-        self.cursor.execute(
-            "UPDATE papers SET is_indexed = ? WHERE id = ?", (int(indexed), paper_id)
-        )
-        self.conn.commit()
-
-    def _row_to_paper(self, row: tuple) -> Paper:
-        return Paper(
-            id=row[0], title=row[1], file_path=row[2], folder_id=row[3],
-            upload_date=row[4], abstract=row[5] or "", authors=row[6] or "",
-            source_url=row[7] or "", is_indexed=bool(row[8]),
-        )
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE papers SET is_indexed = ? WHERE id = ?", (int(indexed), paper_id)
+            )
 
     # ---- Annotation Operations ----
 
     def add_annotation(self, paper_id: int, page: int, content: str,
                        comment: str, color: str, rects_json: str) -> int:
         """Add a highlight annotation and return its ID."""
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.cursor.execute(
-            """INSERT INTO annotations
-               (paper_id, page, content, comment, color, rects_json, created_at, updated_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (paper_id, page, content, comment, color, rects_json, now, now),
-        )
-        self.conn.commit()
-        return self.cursor.lastrowid  # type: ignore
+        with self._write() as conn:
+            return conn.execute(
+                _INSERT_ANNOTATION, (paper_id, page, content, comment, color, rects_json)
+            ).fetchone()[0]
+
+    def add_annotations_bulk(self, rows: List[Tuple[int, int, str, str, str, str]]) -> List[int]:
+        """
+        Add many annotations in one transaction and return their IDs in row order.
+        Each row is (paper_id, page, content, comment, color, rects_json).
+        """
+        with self._write() as conn:
+            return self._insert_many(conn, _ANNOTATION_HEAD, _ANNOTATION_ROW, rows)
 
     def get_annotations(self, paper_id: int) -> List[Annotation]:
         """Return all annotations for a paper."""
-        self.cursor.execute(
-            "SELECT * FROM annotations WHERE paper_id = ? ORDER BY page, id", (paper_id,)
-        )
-        rows = self.cursor.fetchall()
-        return [
-            Annotation(
-                id=r[0], paper_id=r[1], page=r[2], content=r[3],
-                comment=r[4], color=r[5], rects_json=r[6],
-                created_at=r[7] or "", updated_at=r[8] or "",
-            )
-            for r in rows
-        ]
+        rows = self._read().execute(
+            f"SELECT {self._ANNOTATION_COLUMNS} FROM annotations WHERE paper_id = ? ORDER BY page, id",
+            (paper_id,),
+        ).fetchall()
+        return list(starmap(Annotation, rows))
 
     def update_annotation_comment(self, annotation_id: int, comment: str) -> None:
         """Update the comment of an annotation."""
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.cursor.execute(
-            "UPDATE annotations SET comment = ?, updated_at = ? WHERE id = ?",
-            (comment, now, annotation_id),
-        )
-        self.conn.commit()
+        with self._write() as conn:
+            conn.execute(_UPDATE_ANNOTATION_COMMENT, (comment, annotation_id))
 
     def delete_annotation(self, annotation_id: int) -> None:
         """Delete a single annotation."""
-        self.cursor.execute("DELETE FROM annotations WHERE id = ?", (annotation_id,))
-        self.conn.commit()
+        with self._write() as conn:
+            conn.execute("DELETE FROM annotations WHERE id = ?", (annotation_id,))
 
     # ---- Note Operations ----
 
     def get_note(self, paper_id: int) -> str:
         """Return the note content for a paper, or empty string."""
-        self.cursor.execute("SELECT content FROM notes WHERE paper_id = ?", (paper_id,))
-        result = self.cursor.fetchone()
+        result = self._read().execute(
+            "SELECT content FROM notes WHERE paper_id = ?", (paper_id,)
+        ).fetchone()
         return result[0] if result else ""
 
     def save_note(self, paper_id: int, content: str) -> None:
         """Insert or update the note for a paper."""
-        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.cursor.execute("SELECT id FROM notes WHERE paper_id = ?", (paper_id,))
-        if self.cursor.fetchone():
-            self.cursor.execute(
-                "UPDATE notes SET content = ?, updated_at = ? WHERE paper_id = ?",
-                (content, now, paper_id),
-            )
-        else:
-            self.cursor.execute(
-                "INSERT INTO notes (paper_id, content, updated_at) VALUES (?, ?, ?)",
-                (paper_id, content, now),
-            )
-        self.conn.commit()
+        with self._write() as conn:
+            conn.execute(_UPSERT_NOTE, (paper_id, content))
 
     # ---- Text Chunk Operations (for RAG) ----
 
     def save_chunks(self, paper_id: int, chunks: List[TextChunk]) -> None:
-        """Bulk insert text chunks for a paper (clears existing ones first)."""
-        self.cursor.execute("DELETE FROM text_chunks WHERE paper_id = ?", (paper_id,))
-        for c in chunks:
-            self.cursor.execute(
-                """INSERT INTO text_chunks
-                   (paper_id, chunk_index, text, embedding_json, page_start, page_end)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (paper_id, c.chunk_index, c.text, c.embedding_json,
-                 c.page_start, c.page_end),
+        """Bulk insert text chunks for a paper (clears existing ones first) in one transaction."""
+        with self._write() as conn:  # single BEGIN/COMMIT; rolls back the DELETE if an insert fails
+            conn.execute("DELETE FROM text_chunks WHERE paper_id = ?", (paper_id,))
+            conn.executemany(
+                _INSERT_CHUNK,
+                [
+                    (paper_id, c.chunk_index, c.text, c.embedding_blob or None, c.page_start, c.page_end)
+                    for c in chunks
+                ],
             )
-        self.conn.commit()
+        self._bump_chunks_version()
 
     def get_chunks(self, paper_id: int) -> List[TextChunk]:
         """Return all text chunks for a paper."""
-        self.cursor.execute(
-            "SELECT * FROM text_chunks WHERE paper_id = ? ORDER BY chunk_index",
+        rows = self._read().execute(
+            f"SELECT {self._CHUNK_COLUMNS} FROM text_chunks WHERE paper_id = ? ORDER BY chunk_index",
             (paper_id,),
+        ).fetchall()
+        return list(starmap(TextChunk, rows))
+
+    def iter_all_chunks(self) -> Iterator[TextChunk]:
+        """
+        Yield every text chunk in the library, FETCH_BATCH rows at a time.
+        embedding_blob is left empty; stream vectors with iter_all_embeddings.
+        """
+        return starmap(TextChunk, self._iter_rows(
+            f"SELECT {self._CHUNK_TEXT_COLUMNS} FROM text_chunks ORDER BY paper_id, chunk_index"
+        ))
+
+    def iter_all_embeddings(self) -> Iterator[Tuple[int, bytes]]:
+        """Yield (chunk_id, embedding_blob) for every embedded chunk, without the chunk text."""
+        return self._iter_rows(
+            "SELECT id, embedding_blob FROM text_chunks WHERE length(embedding_blob) > 0 ORDER BY id"
         )
-        return [
-            TextChunk(
-                id=r[0], paper_id=r[1], chunk_index=r[2], text=r[3],
-                embedding_json=r[4], page_start=r[5], page_end=r[6],
-            )
-            for r in self.cursor.fetchall()
-        ]
-
-    def get_all_chunks(self) -> List[TextChunk]:
-        """Return all text chunks across the entire library (for library-wide RAG)."""
-        self.cursor.execute("SELECT * FROM text_chunks ORDER BY paper_id, chunk_index")
-        return [
-            TextChunk(
-                id=r[0], paper_id=r[1], chunk_index=r[2], text=r[3],
-                embedding_json=r[4], page_start=r[5], page_end=r[6],
-            )
-            for r in self.cursor.fetchall()
-        ]
+
+    def get_all_embeddings(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Return (ids, matrix) for every embedded chunk: an int64 id array and a
+        row-aligned (N, d) float32 matrix expanded from the stored int8
+        vectors. Chunk text is not loaded; hydrate
+        the winners with get_chunks_by_ids. Rows whose dimension differs from
+        the first one (e.g. from a previous embedding model) are skipped.
+        """
+        import numpy as np  # kept off the UI start-up path
+        from core.quantization import dequantize_embeddings
+
+        # Blobs are appended straight into one buffer, so peak memory is the
+        # matrix itself plus one fetch batch
+        ids = array("q")
+        buf = bytearray()
+        size = 0
+        for chunk_id, blob in self.iter_all_embeddings():
+            if not size:
+                size = len(blob)
+            if len(blob) == size:
+                ids.append(chunk_id)
+                buf += blob
+        if not ids:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32)
+
+        return np.frombuffer(ids, dtype=np.int64), dequantize_embeddings(bytes(buf), len(ids))
+
+    def get_chunks_by_ids(self, chunk_ids: List[int]) -> List[TextChunk]:
+        """Return the chunks with the given IDs (order not guaranteed), without their embeddings."""
+        if not chunk_ids:
+            return []
+        placeholders = ", ".join("?" * len(chunk_ids))
+        rows = self._read().execute(
+            f"SELECT {self._CHUNK_TEXT_COLUMNS} FROM text_chunks WHERE id IN ({placeholders})",
+            list(chunk_ids),
+        ).fetchall()
+        return list(starmap(TextChunk, rows))
+
+    def get_chunks_signature(self) -> Tuple[int, int]:
+        """
+        Return (count, max_id) over embedded chunks.
+        Changes whenever chunks are added or removed, so on-disk vector
+        indexes can detect that they are stale.
+        """
+        count, max_id = self._read().execute(
+            "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM text_chunks "
+            "WHERE length(embedding_blob) > 0"
+        ).fetchone()
+        return count, max_id
+
+    def has_embedded_chunks(self, paper_id: Optional[int] = None) -> bool:
+        """Whether the paper (or, without paper_id, the library) has any embedded chunk; stops at the first."""
+        if paper_id is None:
+            sql, params = "SELECT EXISTS(SELECT 1 FROM text_chunks WHERE length(embedding_blob) > 0)", ()
+        else:
+            sql = ("SELECT EXISTS(SELECT 1 FROM text_chunks "
+                   "WHERE paper_id = ? AND length(embedding_blob) > 0)")
+            params = (paper_id,)
+        return bool(self._read().execute(sql, params).fetchone()[0])
+
+    def _insert_many(self, conn: sqlite3.Connection, head: str, row_sql: str,
+                     rows: List[tuple]) -> List[int]:
+        """Insert rows as multi-row INSERT ... RETURNING id statements; returns IDs in row order."""
+        ids: List[int] = []
+        for start in range(0, len(rows), self.BULK_INSERT_ROWS):
+            batch = rows[start:start + self.BULK_INSERT_ROWS]
+            sql = f"{head}{', '.join([row_sql] * len(batch))} RETURNING id"
+            cur = conn.execute(sql, [value for row in batch for value in row])
+            # RETURNING order is unspecified, but keys grow in VALUES order within one statement
+            ids.extend(sorted(r[0] for r in cur.fetchall()))
+        return ids
+
+    def _iter_rows(self, sql: str, params: tuple = ()) -> Iterator[tuple]:
+        """Run a query on this thread's reader and yield rows FETCH_BATCH at a time."""
+        cur = self._read().execute(sql, params)
+        cur.arraysize = self.FETCH_BATCH
+        try:
+            while True:
+                rows = cur.fetchmany()
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cur.close()
 
     def close(self) -> None:
-        """Close the database connection."""
-        self.conn.close()
+        """Close every reader, then refresh query-planner statistics and close the writer."""
+        with self._readers_lock:
+            for _, conn in self._readers.values():
+                conn.close()
+            self._readers.clear()
+        with self._write_lock:
+            try:
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning(f"PRAGMA optimize failed: {e}")
+            self.conn.close()
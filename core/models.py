@@ -59,7 +59,7 @@ class TextChunk:
     paper_id: Optional[int] = None
     chunk_index: int = 0
     text: str = ""
-    embedding_json: str = ""     # JSON-serialized float list (or empty if using FAISS)
+    embedding_blob: bytes = b""  # int8 vector + float32 scale, see core.quantization (empty if not embedded)
     page_start: int = 0
     page_end: int = 0
 
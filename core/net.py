@@ -0,0 +1,13 @@
+"""
+PaperMiner - Network Utilities
+Helpers shared by the LLM client and the discovery HTTP clients.
+"""
+
+
+def http2_available() -> bool:
+    """Whether httpx can negotiate HTTP/2 (requires the optional `h2` package)."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
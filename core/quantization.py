@@ -0,0 +1,36 @@
+"""
+PaperMiner - Embedding Quantization
+Stored chunk embeddings are int8 with a per-vector float32 scale:
+each BLOB is d int8 components followed by 4 scale bytes, so v ≈ q * scale.
+That is a quarter of the float32 size on disk and in every SQLite scan;
+vectors are expanded back to float32 for similarity search.
+"""
+
+from typing import List
+
+import numpy as np
+
+SCALE_BYTES = 4  # trailing float32 scale
+
+
+def quantize_embeddings(embeddings: np.ndarray) -> List[bytes]:
+    """Pack (N, d) float rows into int8 + scale BLOBs (symmetric, scale = max|v| / 127)."""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    if embeddings.size == 0:
+        return []
+
+    scales = np.abs(embeddings).max(axis=1, keepdims=True) / 127.0
+    scales[scales == 0] = 1.0
+    q = np.rint(embeddings / scales).astype(np.int8)
+    packed = np.concatenate((q.view(np.uint8), scales.view(np.uint8)), axis=1)
+    return [row.tobytes() for row in packed]
+
+
+def dequantize_embeddings(packed: bytes, count: int) -> np.ndarray:
+    """Expand `count` concatenated, equal-length BLOBs into a (count, d) float32 matrix."""
+    raw = np.frombuffer(packed, dtype=np.uint8).reshape(count, -1)
+    dim = raw.shape[1] - SCALE_BYTES
+    scales = raw[:, dim:].copy().view(np.float32)
+    matrix = raw[:, :dim].view(np.int8).astype(np.float32)
+    matrix *= scales
+    return matrix
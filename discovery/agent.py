@@ -5,7 +5,11 @@ aggregates results, and provides summarized recommendations.
 """
 
 import logging
-from typing import List, Dict
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Set
+
+import numpy as np
 
 from ai.llm_client import create_llm_client, LLMClient
 from discovery.arxiv_client import search_arxiv
@@ -13,6 +17,80 @@ from discovery.hf_client import search_hf_papers
 
 logger = logging.getLogger(__name__)
 
+# Exact-duplicate key: hash of the first N normalized title tokens
+TITLE_KEY_TOKENS = 8
+# Near-duplicate cut-off (estimated Jaccard over title character 3-grams), needs datasketch
+NEAR_DUP_THRESHOLD = 0.85
+MINHASH_PERMUTATIONS = 64
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _dedupe_papers(papers: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Drop duplicate candidates, keeping the first occurrence.
+    Titles are compared by their leading word tokens (case and punctuation
+    insensitive); with datasketch installed, near-duplicates (version suffixes,
+    small wording changes) are also caught via MinHash LSH instead of O(N^2)
+    pairwise comparison.
+    """
+    try:
+        from datasketch import MinHash, MinHashLSH
+        lsh = MinHashLSH(threshold=NEAR_DUP_THRESHOLD, num_perm=MINHASH_PERMUTATIONS)
+    except ImportError:
+        lsh = None
+
+    seen: Set[int] = set()
+    unique = []
+    for i, p in enumerate(papers):
+        tokens = _TOKEN_RE.findall(p["title"].lower())
+        key = hash(tuple(tokens[:TITLE_KEY_TOKENS]))
+        if key in seen:
+            continue
+
+        if lsh is not None:
+            text = " ".join(tokens)
+            minhash = MinHash(num_perm=MINHASH_PERMUTATIONS)
+            minhash.update_batch([text[j:j + 3].encode() for j in range(max(1, len(text) - 2))])
+            if lsh.query(minhash):
+                continue
+            lsh.insert(str(i), minhash)
+
+        seen.add(key)
+        unique.append(p)
+    return unique
+
+
+def _rank_by_relevance(query: str, papers: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """
+    Order papers by TF-IDF cosine similarity between the query and each
+    title + abstract (smoothed idf, L2-normalized rows, one matvec).
+    The sort is stable, so equally relevant papers keep their source order.
+    """
+    if len(papers) < 2:
+        return papers
+
+    docs = [_TOKEN_RE.findall(f"{p['title']} {p['abstract']}".lower()) for p in papers]
+    vocab: Dict[str, int] = {}
+    for tokens in docs:
+        for t in tokens:
+            vocab.setdefault(t, len(vocab))
+    query_ids = [vocab[t] for t in _TOKEN_RE.findall(query.lower()) if t in vocab]
+    if not query_ids:
+        return papers
+
+    tf = np.zeros((len(docs), len(vocab)), dtype=np.float32)
+    for row, tokens in enumerate(docs):
+        np.add.at(tf[row], [vocab[t] for t in tokens], 1.0)
+    idf = np.log((1 + len(docs)) / (1 + np.count_nonzero(tf, axis=0))) + 1.0
+    tfidf = tf * idf
+    tfidf /= np.maximum(np.linalg.norm(tfidf, axis=1, keepdims=True), 1e-12)
+
+    q = np.bincount(query_ids, minlength=len(vocab)).astype(np.float32) * idf
+    scores = tfidf @ (q / np.linalg.norm(q))
+    order = np.argsort(-scores, kind="stable")
+    return [papers[i] for i in order]
+
 
 class RecommendationAgent:
     """
@@ -30,7 +108,7 @@ class RecommendationAgent:
         """
         Full recommendation pipeline:
         1. Extract search keywords from user query
-        2. Search ArXiv + HuggingFace
+        2. Search ArXiv + HuggingFace, dedupe and rank by relevance
         3. Summarize findings
 
         Returns:
@@ -40,24 +118,18 @@ class RecommendationAgent:
         keywords = self._extract_keywords(user_query)
         logger.info(f"Agent extracted keywords: {keywords}")
 
-        # Step 2: Search both sources
-        all_papers: List[Dict[str, str]] = []
-        for kw in keywords:
-            arxiv_results = search_arxiv(kw, max_results=max_results // 2)
-            all_papers.extend(arxiv_results)
-
-            hf_results = search_hf_papers(kw, max_results=max_results // 2)
-            all_papers.extend(hf_results)
-
-        # Deduplicate by title similarity
-        seen_titles = set()
-        unique_papers = []
-        for p in all_papers:
-            title_key = p["title"].lower().strip()[:60]
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_papers.append(p)
-
+        # Step 2: Search both sources for every keyword concurrently (network-bound,
+        # independent requests); results keep keyword order
+        with ThreadPoolExecutor(max_workers=max(1, 2 * len(keywords))) as pool:
+            futures = []
+            for kw in keywords:
+                futures.append(pool.submit(search_arxiv, kw, max_results=max_results // 2))
+                futures.append(pool.submit(search_hf_papers, kw, max_results=max_results // 2))
+            all_papers: List[Dict[str, str]] = [p for f in futures for p in f.result()]
+
+        # Deduplicate by title similarity, then keep the most relevant
+        unique_papers = _dedupe_papers(all_papers)
+        unique_papers = _rank_by_relevance(f"{user_query} {' '.join(keywords)}", unique_papers)
         unique_papers = unique_papers[:max_results]
 
         # Step 3: Generate summary
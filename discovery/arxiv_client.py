@@ -6,15 +6,30 @@ Uses the ArXiv API (https://info.arxiv.org/help/api/index.html).
 
 import logging
 import xml.etree.ElementTree as ET
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Tuple
 from urllib.parse import quote
 
 import httpx
 
+from discovery.http_client import get_http_client, ttl_bucket
+
 logger = logging.getLogger(__name__)
 
 ARXIV_API_BASE = "http://export.arxiv.org/api/query"
 
+# Fully qualified Atom tags: find() with a {ns}tag string skips prefix-to-namespace
+# path translation on every lookup
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_T_ENTRY = f"{_ATOM}entry"
+_T_TITLE = f"{_ATOM}title"
+_T_SUMMARY = f"{_ATOM}summary"
+_T_PUBLISHED = f"{_ATOM}published"
+_T_AUTHOR = f"{_ATOM}author"
+_T_NAME = f"{_ATOM}name"
+_T_LINK = f"{_ATOM}link"
+_T_ID = f"{_ATOM}id"
+
 
 def search_arxiv(
     keyword: str,
@@ -40,22 +55,11 @@ def search_arxiv(
         "Date (Oldest)": "submittedDate",
     }
     sort_param = sort_map.get(sort_by, "relevance")
-    order = "descending" if sort_param != "submittedDate" else "ascending"
-
-    params = {
-        "search_query": f"all:{quote(keyword)}",
-        "start": start,
-        "max_results": max_results,
-        "sortBy": sort_param,
-        "sortOrder": order,
-    }
 
     try:
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(ARXIV_API_BASE, params=params)
-            response.raise_for_status()
-
-        return _parse_arxiv_response(response.text)
+        results = _fetch_arxiv(keyword, max_results, sort_param, start, ttl_bucket())
+        # Copies, so callers can't mutate the cached entries
+        return [dict(p) for p in results]
     except httpx.TimeoutException:
         logger.error("ArXiv API request timed out.")
         return []
@@ -64,54 +68,65 @@ def search_arxiv(
         return []
 
 
-def _parse_arxiv_response(xml_text: str) -> List[Dict[str, str]]:
-    """Parse ArXiv Atom XML response into a list of paper dicts."""
-    ns = {
-        "atom": "http://www.w3.org/2005/Atom",
-        "arxiv": "http://arxiv.org/schemas/atom",
+@lru_cache(maxsize=256)
+def _fetch_arxiv(
+    keyword: str, max_results: int, sort_param: str, start: int, _bucket: int
+) -> Tuple[Dict[str, str], ...]:
+    """Run one ArXiv query; repeats within the same TTL window are served from memory."""
+    order = "descending" if sort_param != "submittedDate" else "ascending"
+    params = {
+        "search_query": f"all:{quote(keyword)}",
+        "start": start,
+        "max_results": max_results,
+        "sortBy": sort_param,
+        "sortOrder": order,
     }
 
-    results = []
+    response = get_http_client().get(ARXIV_API_BASE, params=params)
+    response.raise_for_status()
+    return tuple(_parse_arxiv_response(response.content))
+
+
+def _parse_arxiv_response(xml_bytes: bytes) -> List[Dict[str, str]]:
+    """Parse ArXiv Atom XML response into a list of paper dicts."""
     try:
-        root = ET.fromstring(xml_text)
-        for entry in root.findall("atom:entry", ns):
-            title_el = entry.find("atom:title", ns)
-            summary_el = entry.find("atom:summary", ns)
-            published_el = entry.find("atom:published", ns)
-
-            # Authors
-            authors = []
-            for author_el in entry.findall("atom:author", ns):
-                name_el = author_el.find("atom:name", ns)
-                if name_el is not None and name_el.text:
-                    authors.append(name_el.text.strip())
-
-            # Links
-            abs_url = ""
-            pdf_url = ""
-            for link_el in entry.findall("atom:link", ns):
-                if link_el.get("title") == "pdf":
-                    pdf_url = link_el.get("href", "")
-                elif link_el.get("type") == "text/html":
-                    abs_url = link_el.get("href", "")
-
-            if not abs_url:
-                id_el = entry.find("atom:id", ns)
-                abs_url = id_el.text.strip() if id_el is not None and id_el.text else ""
-
-            results.append({
-                "title": _clean_text(title_el.text if title_el is not None else ""),
-                "authors": ", ".join(authors[:5]) + ("..." if len(authors) > 5 else ""),
-                "abstract": _clean_text(summary_el.text if summary_el is not None else ""),
-                "date": (published_el.text[:10] if published_el is not None and published_el.text else ""),
-                "url": abs_url,
-                "pdf_url": pdf_url,
-                "source": "ArXiv",
-            })
+        root = ET.fromstring(xml_bytes)
     except ET.ParseError as e:
         logger.error(f"Failed to parse ArXiv XML: {e}")
-
-    return results
+        return []
+    return [_parse_entry(entry) for entry in root.findall(_T_ENTRY)]
+
+
+def _parse_entry(entry) -> Dict[str, str]:
+    """Convert one Atom <entry> element into a paper dict."""
+    # Authors
+    authors = []
+    for author_el in entry.findall(_T_AUTHOR):
+        name = author_el.findtext(_T_NAME)
+        if name:
+            authors.append(name.strip())
+
+    # Links
+    abs_url = ""
+    pdf_url = ""
+    for link_el in entry.findall(_T_LINK):
+        if link_el.get("title") == "pdf":
+            pdf_url = link_el.get("href", "")
+        elif link_el.get("type") == "text/html":
+            abs_url = link_el.get("href", "")
+
+    if not abs_url:
+        abs_url = (entry.findtext(_T_ID) or "").strip()
+
+    return {
+        "title": _clean_text(entry.findtext(_T_TITLE)),
+        "authors": ", ".join(authors[:5]) + ("..." if len(authors) > 5 else ""),
+        "abstract": _clean_text(entry.findtext(_T_SUMMARY)),
+        "date": (entry.findtext(_T_PUBLISHED) or "")[:10],
+        "url": abs_url,
+        "pdf_url": pdf_url,
+        "source": "ArXiv",
+    }
 
 
 def _clean_text(text: str) -> str:
@@ -4,17 +4,23 @@ Fetches trending/daily papers from HuggingFace using the mirror endpoint.
 """
 
 import logging
-from typing import List, Dict
+import threading
+from functools import lru_cache
+from typing import Any, List, Dict, Tuple
 
 import httpx
 
 from config import HF_MIRROR_URL
+from discovery.http_client import get_http_client, ttl_bucket
 
 logger = logging.getLogger(__name__)
 
 # HuggingFace Daily Papers API endpoint (using mirror for China mainland)
 HF_PAPERS_API = f"{HF_MIRROR_URL}/api/daily_papers"
 
+# Concurrent keyword searches wait for one fetch instead of each missing the cache
+_fetch_lock = threading.Lock()
+
 
 def search_hf_papers(
     keyword: str = "",
@@ -34,10 +40,8 @@ def search_hf_papers(
         List of paper dicts with keys: title, authors, abstract, date, url, pdf_url, source
     """
     try:
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(HF_PAPERS_API)
-            response.raise_for_status()
-            data = response.json()
+        with _fetch_lock:
+            data = _fetch_daily_papers(ttl_bucket())
 
         results = []
         for item in data:
@@ -83,3 +87,11 @@ def search_hf_papers(
     except Exception as e:
         logger.error(f"HuggingFace papers error: {e}")
         return []
+
+
+@lru_cache(maxsize=4)
+def _fetch_daily_papers(_bucket: int) -> Tuple[Any, ...]:
+    """Fetch the daily papers list once per TTL window; every keyword filters the same list."""
+    response = get_http_client().get(HF_PAPERS_API)
+    response.raise_for_status()
+    return tuple(response.json())
@@ -0,0 +1,80 @@
+"""
+PaperMiner - Discovery HTTP Client
+Shared HTTP client for the ArXiv / HuggingFace clients. Uses hishel's
+caching client when installed (responses persisted to HTTP_CACHE_PATH,
+ETag / Last-Modified revalidation handled automatically), otherwise a
+plain pooled httpx.Client. PDF downloads get their own pooled, uncached client.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from config import HTTP_CACHE_PATH
+from core.net import http2_available
+
+logger = logging.getLogger(__name__)
+
+# How long fetched search results are reused (on disk and in-process), seconds
+HTTP_CACHE_TTL = 3600
+
+
+def _client_options() -> dict:
+    # HTTP/2 multiplexes concurrent requests over one connection per host
+    return dict(
+        timeout=httpx.Timeout(30.0),
+        limits=httpx.Limits(max_keepalive_connections=8),
+        http2=http2_available(),
+    )
+
+
+def _create_client() -> httpx.Client:
+    options = _client_options()
+    try:
+        import hishel
+        from hishel.httpx import SyncCacheClient
+    except ImportError:
+        logger.info("hishel not installed, discovery responses are not cached on disk.")
+        return httpx.Client(**options)
+
+    storage = hishel.SyncSqliteStorage(database_path=HTTP_CACHE_PATH, default_ttl=HTTP_CACHE_TTL)
+    return SyncCacheClient(storage=storage, **options)
+
+
+def ttl_bucket() -> int:
+    """Index of the current HTTP_CACHE_TTL window; add it to in-process cache keys to expire them."""
+    return int(time.time() // HTTP_CACHE_TTL)
+
+
+# --- Shared Instance ---
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Return the process-wide discovery client (thread-safe, keep-alive pooled)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = _create_client()
+            atexit.register(_client.close)
+        return _client
+
+
+_download_client: Optional[httpx.Client] = None
+
+
+def get_download_client() -> httpx.Client:
+    """Return the process-wide client for PDF downloads (pooled like discovery, never cached)."""
+    global _download_client
+    with _client_lock:
+        if _download_client is None:
+            options = _client_options()
+            options["timeout"] = httpx.Timeout(60.0)
+            _download_client = httpx.Client(follow_redirects=True, **options)
+            atexit.register(_download_client.close)
+        return _download_client
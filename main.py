@@ -10,9 +10,12 @@ import os
 import logging
 
 # --- Critical Environment Setup (must be before any Qt imports) ---
-# Fixes Win11 GPU/sandbox issues with QWebEngine rendering local PDFs
+# Fixes Win11 GPU/sandbox issues with QWebEngine rendering local PDFs;
+# the rest turns off browser features PDF.js never uses and keeps a single renderer
 os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = (
     "--disable-gpu --allow-file-access-from-files --no-sandbox"
+    " --disable-features=Translate,MediaRouter,OptimizationHints"
+    " --renderer-process-limit=1"
 )
 os.environ["QTWEBENGINE_DISABLE_SANDBOX"] = "1"
 
@@ -60,6 +63,8 @@ def main() -> None:
     logger.info(f"App root: {APP_ROOT}")
     logger.info(f"LLM provider: {settings.llm.provider} / {settings.llm.model_name}")
 
+    # Coalesce mouse-move/resize/wheel bursts (streaming chat, splitter drags) into one event each
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_CompressHighFrequencyEvents, True)
     app = QApplication(sys.argv)
     app.setApplicationName("PaperMiner")
     app.setOrganizationName("PaperMiner")
@@ -40,6 +40,22 @@ function initBridge() {
 
     new QWebChannel(qt.webChannelTransport, function(channel) {
         pyBridge = channel.objects.pyBridge;
+        pyBridge.annotations_loaded.connect(function(rowsJson) {
+            window.loadAnnotations(JSON.parse(rowsJson).map(function(row) {
+                return {
+                    id: row[0], page: row[1], content: row[2],
+                    comment: row[3], color: row[4], rects: JSON.parse(row[5] || "[]")
+                };
+            }));
+        });
+        pyBridge.annotations_confirmed.connect(function(idsJson) {
+            window.confirmAnnotations(JSON.parse(idsJson));
+        });
+        pyBridge.zoom.connect(function(factor) {
+            if (viewerApp) {
+                viewerApp.pdfViewer.currentScale *= factor;
+            }
+        });
         console.log("QWebChannel bridge established.");
         initViewer();
     });
@@ -51,8 +67,9 @@ function initBridge() {
 function initViewer() {
     const params = new URLSearchParams(window.location.search);
     const fileUrl = params.get("file");
+    const prewarm = params.has("prewarm");
 
-    if (!fileUrl) {
+    if (!fileUrl && !prewarm) {
         console.error("No 'file' parameter provided in URL.");
         showToast("Error: No PDF file specified", 3000);
         return;
@@ -68,7 +85,8 @@ function initViewer() {
     const pdfjsViewerPath = resolvePdfjsPath();
     console.log("PDF.js viewer path:", pdfjsViewerPath);
     
-    const viewerUrl = pdfjsViewerPath + "?file=" + encodeURIComponent(fileUrl);
+    // Prewarm starts PDF.js with no document; Python then opens papers via openPdfAt
+    const viewerUrl = pdfjsViewerPath + "?file=" + encodeURIComponent(fileUrl || "");
     console.log("Final viewer URL:", viewerUrl);
 
     const iframe = document.getElementById("viewer-frame");
@@ -161,6 +179,13 @@ function setupIframeListeners(iframe) {
             });
         }
 
+        // openPdfAt is usable once PDF.js has finished initializing
+        viewerApp.initializedPromise.then(function() {
+            if (pyBridge) {
+                pyBridge.onBridgeReady();
+            }
+        });
+
         console.log("[OK] Iframe listeners installed successfully");
     } catch (err) {
         console.error("[ERROR] Failed to set up iframe listeners:", err);
@@ -406,7 +431,7 @@ function deleteHighlight() {
 }
 
 /**
- * Load annotations from Python (called via pyBridge after viewer is ready).
+ * Load annotations from Python (pyBridge.annotations_loaded, emitted after viewer is ready).
  * @param {Array} annList - Array of annotation objects from the database.
  */
 window.loadAnnotations = function(annList) {
@@ -418,6 +443,21 @@ window.loadAnnotations = function(annList) {
     }
 };
 
+/**
+ * Open another PDF in the running viewer instead of reloading the whole bridge page.
+ * The "documentloaded" listener fires again, so Python re-sends the annotations.
+ * @param {string} url - local:/// URL of the PDF.
+ */
+window.openPdfAt = function(url) {
+    menuJustShown = false;
+    hideContextMenu();
+    annotations = [];
+    selectedText = "";
+    selectionRects = [];
+    currentHighlightId = null;
+    viewerApp.open({ url: url });
+};
+
 /**
  * Confirm an annotation was saved by Python and update its temporary ID.
  * @param {number} realId - The database ID of the saved annotation.
@@ -453,6 +493,16 @@ window.confirmAnnotation = function(realId) {
     }
 };
 
+/**
+ * Confirm several saved annotations at once (Python batches them per event-loop pass).
+ * @param {number[]} realIds - Database IDs, in the order the annotations were saved.
+ */
+window.confirmAnnotations = function(realIds) {
+    realIds.forEach(function(realId) {
+        window.confirmAnnotation(realId);
+    });
+};
+
 /**
  * Render a highlight overlay on the PDF page.
  */
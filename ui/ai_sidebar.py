@@ -7,60 +7,250 @@ Collapsible right-side panel for AI-powered interactions:
 """
 
 import logging
-from typing import Optional
+import sys
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QLineEdit,
-    QPushButton, QLabel, QComboBox, QScrollArea, QFrame,
+    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QPlainTextEdit, QApplication,
+    QPushButton, QLabel, QComboBox, QListView, QMenu, QStyledItemDelegate,
+    QStyleOptionViewItem, QAbstractItemView,
+)
+from PyQt6.QtCore import Qt, pyqtSignal, QAbstractListModel, QModelIndex, QRectF, QSize, QThreadPool, QTimer
+from PyQt6.QtGui import (
+    QAbstractTextDocumentLayout, QBrush, QColor, QFont, QFontMetrics, QPainter, QPalette, QTextDocument,
 )
-from PyQt6.QtCore import Qt, pyqtSignal
 
 from core.database import DatabaseManager
+from workers.async_workers import ChatWorker
+
+if TYPE_CHECKING:
+    from ai.chat_handler import ChatHandler
 
 logger = logging.getLogger(__name__)
 
+# Bubble geometry (px): the free gutter on the far side marks who is speaking
+_BUBBLE_INDENT = 40
+_BUBBLE_PAD_X = 10
+_BUBBLE_PAD_Y = 6
+_BUBBLE_SPACING = 6
+_BUBBLE_RADIUS = 8
+# Speakers are stored as small int tags that index _BUBBLE_PARAMS
+ROLE_USER, ROLE_AI = 0, 1
+_ROLE_TAGS = {"user": ROLE_USER, "assistant": ROLE_AI}
+# Per tag: (bubble brush, role label, left gutter, right gutter)
+_BUBBLE_PARAMS = (
+    (QBrush(QColor("#264F78")), "🧑 You", _BUBBLE_INDENT, 0),
+    (QBrush(QColor("#2D2D2D")), "🤖 AI", 0, _BUBBLE_INDENT),
+)
+# Short messages (placeholders, status lines) repeat a lot and are interned
+_INTERN_MAX_LEN = 64
+_ROLE_ALIGN = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop
+_ROLE_COLOR = QColor("#808080")
+_TEXT_COLOR = QColor("#D4D4D4")
+# Streamed tokens arriving within one frame are applied to the model together (ms)
+_CHUNK_FLUSH_MS = 16
+# Extra laid-out documents kept beyond the rows that fit in the viewport
+_DOC_CACHE_SLACK = 4
+# Widths whose measured height is remembered per row (sidebar toggles, window resizes)
+_HEIGHT_WIDTHS = 4
 
-class ChatBubble(QFrame):
-    """A single chat message bubble."""
 
-    def __init__(self, role: str, content: str, parent: QWidget = None) -> None:
-        super().__init__(parent)
-        self.setFrameShape(QFrame.Shape.StyledPanel)
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(10, 6, 10, 6)
+def _chat_row(speaker: str, content: str) -> Tuple[int, str]:
+    """Row for ("user" | "assistant", content): speaker tag plus (interned, if short) text."""
+    if len(content) < _INTERN_MAX_LEN:
+        content = sys.intern(content)
+    return _ROLE_TAGS.get(speaker, ROLE_AI), content
 
-        is_user = role == "user"
-        bg_color = "#264F78" if is_user else "#2D2D2D"
-        align = "right" if is_user else "left"
 
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {bg_color};
-                border-radius: 8px;
-                border: none;
-                margin: 2px {'2px 2px 40px' if is_user else '40px 2px 2px'};
-            }}
-        """)
+class ChatModel(QAbstractListModel):
+    """Chat history as (speaker tag, content) rows; the view only lays out visible ones."""
 
-        role_label = QLabel("🧑 You" if is_user else "🤖 AI")
-        role_label.setStyleSheet("color: #808080; font-size: 11px; font-weight: bold;")
-        layout.addWidget(role_label)
+    SpeakerRole = Qt.ItemDataRole.UserRole  # ROLE_USER / ROLE_AI
 
-        text_label = QLabel(content)
-        text_label.setWordWrap(True)
-        text_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
-        text_label.setStyleSheet("color: #D4D4D4; font-size: 13px; padding: 2px;")
-        layout.addWidget(text_label)
+    def __init__(self, parent: QWidget = None) -> None:
+        super().__init__(parent)
+        self._rows: List[Tuple[int, str]] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        tag, content = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return content
+        if role == self.SpeakerRole:
+            return tag
+        return None
+
+    def append(self, speaker: str, content: str) -> None:
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.append(_chat_row(speaker, content))
+        self.endInsertRows()
+
+    def extend(self, items: List[Tuple[str, str]]) -> None:
+        """Append several (speaker, content) rows with a single insert notification."""
+        if not items:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        self._rows.extend(_chat_row(speaker, content) for speaker, content in items)
+        self.endInsertRows()
+
+    def set_content(self, row: int, content: str) -> None:
+        tag, _ = self._rows[row]
+        self._rows[row] = (tag, content)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def append_chunk(self, row: int, chunk: str) -> None:
+        """Extend a row's text in place (streamed replies update one row, not many)."""
+        tag, content = self._rows[row]
+        self._rows[row] = (tag, content + chunk)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def reset(self, items: List[Tuple[str, str]] = ()) -> None:
+        """Swap in a new history (empty by default) with a single model reset."""
+        self.beginResetModel()
+        self._rows = [_chat_row(speaker, content) for speaker, content in items]
+        self.endResetModel()
+
+
+class ChatBubbleDelegate(QStyledItemDelegate):
+    """Paints each chat message as a rounded bubble with wrapped text; no per-message widgets."""
+
+    def __init__(self, view: QListView) -> None:
+        super().__init__(view)
+        self._view = view
+        self._role_font = QFont()
+        self._role_font.setPixelSize(11)
+        self._role_font.setBold(True)
+        self._role_height = QFontMetrics(self._role_font).height()
+        self._text_font = QFont()
+        self._text_font.setPixelSize(13)
+        self._min_row_height = (
+            2 * _BUBBLE_PAD_Y + self._role_height + 2
+            + QFontMetrics(self._text_font).height() + _BUBBLE_SPACING
+        )
+        # One scratch document measures every row; only visible rows keep their own
+        self._measure_doc = self._new_document()
+        self._paint_context = QAbstractTextDocumentLayout.PaintContext()
+        self._paint_context.palette.setColor(QPalette.ColorRole.Text, _TEXT_COLOR)
+        self._docs: "OrderedDict[int, QTextDocument]" = OrderedDict()  # row -> laid-out text
+        self._heights: Dict[int, Dict[int, int]] = {}  # row -> {text width: row height}
+        self._text_metrics = QFontMetrics(self._text_font)
+        self._measure_doc.setPlainText("X")
+        self._line_height = self._measure_doc.size().height()
+
+    def clear_cache(self) -> None:
+        self._docs.clear()
+        self._heights.clear()
+
+    def invalidate_rows(self, top_left: QModelIndex, bottom_right: QModelIndex) -> None:
+        """Drop cached layout for edited rows and ask the view to re-measure them."""
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self._docs.pop(row, None)
+            self._heights.pop(row, None)
+            self.sizeHintChanged.emit(top_left.siblingAtRow(row))
+
+    def _new_document(self) -> QTextDocument:
+        doc = QTextDocument()
+        doc.setDocumentMargin(0)
+        doc.setDefaultFont(self._text_font)
+        return doc
+
+    def _text_width(self) -> int:
+        return max(60, self._view.viewport().width() - _BUBBLE_INDENT - 2 * _BUBBLE_PAD_X)
+
+    def _document(self, index: QModelIndex, width: int) -> QTextDocument:
+        """Return the painted row's text document laid out at `width` (LRU over visible rows)."""
+        row = index.row()
+        doc = self._docs.get(row)
+        if doc is None:
+            doc = self._new_document()
+            doc.setPlainText(index.data())
+            self._docs[row] = doc
+            limit = self._view.viewport().height() // self._min_row_height + _DOC_CACHE_SLACK
+            while len(self._docs) > limit:
+                self._docs.popitem(last=False)
+        else:
+            self._docs.move_to_end(row)
+        if doc.textWidth() != width:
+            doc.setTextWidth(width)
+        return doc
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        # QListView asks for every row's size on each relayout; remember heights per width
+        width = self._text_width()
+        widths = self._heights.setdefault(index.row(), {})
+        height = widths.get(width)
+        if height is None:
+            height = self._measure(index.data(), width)
+            widths[width] = height
+            if len(widths) > _HEIGHT_WIDTHS:
+                del widths[next(iter(widths))]
+        return QSize(self._view.viewport().width(), height)
+
+    def _measure(self, text: str, width: int) -> int:
+        if "\n" not in text and self._text_metrics.horizontalAdvance(text) < width:
+            text_height = self._line_height  # fits on one line: no text layout needed
+        else:
+            doc = self._measure_doc
+            doc.setTextWidth(width)
+            doc.setPlainText(text)
+            text_height = doc.size().height()
+        return int(2 * _BUBBLE_PAD_Y + self._role_height + 2 + text_height + _BUBBLE_SPACING)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        brush, label, left, right = _BUBBLE_PARAMS[index.data(ChatModel.SpeakerRole)]
+        rect = option.rect.adjusted(left, 0, -right, -_BUBBLE_SPACING)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(brush)
+        painter.drawRoundedRect(QRectF(rect), _BUBBLE_RADIUS, _BUBBLE_RADIUS)
+
+        painter.setFont(self._role_font)
+        painter.setPen(_ROLE_COLOR)
+        painter.drawText(
+            rect.adjusted(_BUBBLE_PAD_X, _BUBBLE_PAD_Y, -_BUBBLE_PAD_X, 0),
+            _ROLE_ALIGN,
+            label,
+        )
+
+        doc = self._document(index, self._text_width())
+        painter.translate(rect.left() + _BUBBLE_PAD_X, rect.top() + _BUBBLE_PAD_Y + self._role_height + 2)
+        doc.documentLayout().draw(painter, self._paint_context)
+        painter.restore()
 
 
 class AISidebar(QWidget):
     """Collapsible AI chat sidebar with mode switching."""
 
     message_sent = pyqtSignal(str, str)  # (mode, message)
+    save_to_notes = pyqtSignal(str)       # text to append to the open paper's notes
 
     def __init__(self, db: DatabaseManager, parent: QWidget = None) -> None:
         super().__init__(parent)
         self.db = db
+        # The creating MainWindow; kept because the splitter re-parents this widget
+        self._main = parent
+        self._reply_row = -1  # placeholder row awaiting the pending ChatWorker reply
+        self._reply_streaming = False  # True once the first token replaced the placeholder
+        # One handler for the conversation, so its history reaches the LLM; built on first send
+        self._chat_handler: Optional["ChatHandler"] = None
+        self._history_scope: Optional[Tuple[str, Optional[int]]] = None  # (mode, paper_id) of that history
+        self._scroll_pending = False
+        self._chunk_buffer: List[str] = []
+        self._chunk_timer = QTimer(self)
+        self._chunk_timer.setSingleShot(True)
+        self._chunk_timer.setInterval(_CHUNK_FLUSH_MS)
+        self._chunk_timer.timeout.connect(self._flush_chunks)
         self.setMinimumWidth(300)
         self.setMaximumWidth(500)
 
@@ -73,12 +263,12 @@ class AISidebar(QWidget):
 
         # Header bar
         header = QWidget()
-        header.setStyleSheet("background-color: #252526; border-bottom: 1px solid #3C3C3C;")
+        header.setObjectName("aiHeader")
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(12, 8, 12, 8)
 
         title = QLabel("🤖 AI Assistant")
-        title.setStyleSheet("color: #569CD6; font-size: 14px; font-weight: bold;")
+        title.setObjectName("aiTitle")
         header_layout.addWidget(title)
 
         header_layout.addStretch()
@@ -86,78 +276,51 @@ class AISidebar(QWidget):
         # Mode selector
         self.mode_selector = QComboBox()
         self.mode_selector.addItems(["Chat with Paper", "Chat with Library", "Free Chat"])
-        self.mode_selector.setStyleSheet("""
-            QComboBox {
-                background: #3C3C3C; color: #D4D4D4; border: 1px solid #555;
-                border-radius: 4px; padding: 4px 8px; font-size: 12px;
-            }
-            QComboBox::drop-down { border: none; }
-            QComboBox QAbstractItemView {
-                background: #252526; color: #D4D4D4; selection-background-color: #094771;
-            }
-        """)
+        self.mode_selector.setObjectName("modeSelector")
         header_layout.addWidget(self.mode_selector)
 
         layout.addWidget(header)
 
-        # Chat history area (scrollable)
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setStyleSheet("QScrollArea { border: none; background: #1E1E1E; }")
-
-        self.chat_container = QWidget()
-        self.chat_layout = QVBoxLayout(self.chat_container)
-        self.chat_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.chat_layout.setContentsMargins(8, 8, 8, 8)
-        self.chat_layout.setSpacing(6)
-
-        self.scroll_area.setWidget(self.chat_container)
-        layout.addWidget(self.scroll_area, stretch=1)
-
-        # Input area
+        # Chat history: a virtualized list, bubbles are painted by the delegate
+        self.chat_model = ChatModel(self)
+        self.chat_view = QListView()
+        self.chat_view.setObjectName("chatView")
+        self.chat_view.setModel(self.chat_model)
+        self.chat_delegate = ChatBubbleDelegate(self.chat_view)
+        self.chat_view.setItemDelegate(self.chat_delegate)
+        self.chat_model.modelReset.connect(self.chat_delegate.clear_cache)
+        self.chat_model.dataChanged.connect(self.chat_delegate.invalidate_rows)
+        self.chat_view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.chat_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.chat_view.setResizeMode(QListView.ResizeMode.Adjust)  # re-wrap bubbles on resize
+        self.chat_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.chat_view.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.chat_view.customContextMenuRequested.connect(self._on_chat_context_menu)
+        layout.addWidget(self.chat_view, stretch=1)
+
+        # Input area: one grid (input box across the top, buttons right-aligned below)
         input_widget = QWidget()
-        input_widget.setStyleSheet("background-color: #252526; border-top: 1px solid #3C3C3C;")
-        input_layout = QVBoxLayout(input_widget)
+        input_widget.setObjectName("aiInputBar")
+        input_layout = QGridLayout(input_widget)
         input_layout.setContentsMargins(8, 8, 8, 8)
         input_layout.setSpacing(6)
+        input_layout.setColumnStretch(0, 1)
 
-        self.input_box = QTextEdit()
+        self.input_box = QPlainTextEdit()
         self.input_box.setPlaceholderText("Ask anything about your papers...")
         self.input_box.setMaximumHeight(80)
-        self.input_box.setStyleSheet("""
-            QTextEdit {
-                background: #1E1E1E; color: #D4D4D4;
-                border: 1px solid #3C3C3C; border-radius: 6px;
-                padding: 6px; font-size: 13px;
-            }
-            QTextEdit:focus { border-color: #007ACC; }
-        """)
-        input_layout.addWidget(self.input_box)
-
-        btn_row = QHBoxLayout()
+        self.input_box.setObjectName("chatInput")
+        input_layout.addWidget(self.input_box, 0, 0, 1, 3)
+
         self.btn_send = QPushButton("Send ⏎")
         self.btn_send.clicked.connect(self._on_send)
-        self.btn_send.setStyleSheet("""
-            QPushButton {
-                background: #0E639C; color: white; border: none;
-                border-radius: 4px; padding: 6px 20px; font-size: 13px;
-            }
-            QPushButton:hover { background: #1177BB; }
-        """)
-        btn_row.addStretch()
+        self.btn_send.setObjectName("btnSend")
 
         self.btn_clear = QPushButton("Clear")
         self.btn_clear.clicked.connect(self._clear_chat)
-        self.btn_clear.setStyleSheet("""
-            QPushButton {
-                background: transparent; color: #808080; border: 1px solid #3C3C3C;
-                border-radius: 4px; padding: 6px 12px; font-size: 12px;
-            }
-            QPushButton:hover { color: #D4D4D4; border-color: #555; }
-        """)
-        btn_row.addWidget(self.btn_clear)
-        btn_row.addWidget(self.btn_send)
-        input_layout.addLayout(btn_row)
+        self.btn_clear.setObjectName("btnClear")
+        input_layout.addWidget(self.btn_clear, 1, 1)
+        input_layout.addWidget(self.btn_send, 1, 2)
 
         layout.addWidget(input_widget)
 
@@ -175,17 +338,109 @@ class AISidebar(QWidget):
         mode = self.mode_selector.currentText()
         self.message_sent.emit(mode, text)
 
-        # TODO: Connect to workers/async_workers → AI chat handler
-        # For now, placeholder response
-        self._add_bubble("assistant", f"[{mode}] Thinking... (AI backend not yet connected)")
+        # The LLM call runs on the global thread pool; its reply fills this placeholder
+        self._add_bubble("assistant", "Thinking...")
+        self._reply_row = self.chat_model.rowCount() - 1
+        self._reply_streaming = False
+        self._set_busy(True)
+
+        paper_id = self._current_paper_id()
+        handler = self._ensure_chat_handler()
+        # History from another mode or paper would mislead the model
+        if self._history_scope != (mode, paper_id):
+            handler.clear_history()
+            self._history_scope = (mode, paper_id)
+
+        worker = ChatWorker(handler, mode, text, paper_id=paper_id)
+        worker.signals.chunk_received.connect(self._on_reply_chunk)
+        worker.signals.response_ready.connect(self._on_reply)
+        worker.signals.error_occurred.connect(self._on_reply_error)
+        worker.signals.finished_signal.connect(self._on_reply_finished)
+        QThreadPool.globalInstance().start(worker)
+
+    def _ensure_chat_handler(self) -> "ChatHandler":
+        if self._chat_handler is None:
+            # The RAG stack is imported by the startup prewarm, not at sidebar construction
+            from ai.chat_handler import ChatHandler
+            self._chat_handler = ChatHandler(self.db)
+        return self._chat_handler
+
+    def _current_paper_id(self) -> Optional[int]:
+        """Paper open in the Manage view, if any (used by "Chat with Paper")."""
+        manage_view = getattr(self._main, "manage_view", None)
+        return manage_view.current_paper_id if manage_view is not None else None
+
+    def _on_reply_chunk(self, chunk: str) -> None:
+        self._chunk_buffer.append(chunk)
+        if not self._chunk_timer.isActive():
+            self._chunk_timer.start()
+
+    def _flush_chunks(self) -> None:
+        """Apply buffered tokens as one row update (one relayout and scroll per frame)."""
+        if not self._chunk_buffer:
+            return
+        text = "".join(self._chunk_buffer)
+        self._chunk_buffer.clear()
+        if self._reply_streaming:
+            self.chat_model.append_chunk(self._reply_row, text)
+        else:
+            self._reply_streaming = True
+            self.chat_model.set_content(self._reply_row, text)
+        self._scroll_to_bottom()
+
+    def _drop_pending_chunks(self) -> None:
+        self._chunk_timer.stop()
+        self._chunk_buffer.clear()
+
+    def _on_reply(self, content: str) -> None:
+        self._drop_pending_chunks()
+        self.chat_model.set_content(self._reply_row, content)
+        self._scroll_to_bottom()
+
+    def _on_reply_error(self, message: str) -> None:
+        self._drop_pending_chunks()
+        self.chat_model.set_content(self._reply_row, f"⚠️ {message}")
+
+    def _on_reply_finished(self) -> None:
+        self._set_busy(False)
+
+    def _set_busy(self, busy: bool) -> None:
+        # Clearing mid-reply would leave the pending reply pointing at a removed row
+        self.btn_send.setEnabled(not busy)
+        self.btn_clear.setEnabled(not busy)
 
     def _add_bubble(self, role: str, content: str) -> None:
-        bubble = ChatBubble(role, content)
-        self.chat_layout.addWidget(bubble)
-        # Auto-scroll to bottom
-        self.scroll_area.verticalScrollBar().setValue(
-            self.scroll_area.verticalScrollBar().maximum()
-        )
+        self.chat_model.append(role, content)
+        self._scroll_to_bottom()
+
+    def _scroll_to_bottom(self) -> None:
+        """Scroll after the view's pending relayout; calls within one event-loop turn coalesce."""
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            QTimer.singleShot(0, self._do_scroll_to_bottom)
+
+    def _do_scroll_to_bottom(self) -> None:
+        self._scroll_pending = False
+        self.chat_view.scrollToBottom()
+
+    def add_bubbles_bulk(self, items: List[Tuple[str, str]]) -> None:
+        """Append many (role, content) messages at once, e.g. when restoring a conversation."""
+        self.chat_view.setUpdatesEnabled(False)
+        try:
+            self.chat_model.extend(items)
+        finally:
+            self.chat_view.setUpdatesEnabled(True)
+        self._scroll_to_bottom()
+
+    def _on_chat_context_menu(self, pos) -> None:
+        """Offer copying a message (painted bubbles have no selectable text)."""
+        index = self.chat_view.indexAt(pos)
+        if not index.isValid():
+            return
+        menu = QMenu(self)
+        copy_action = menu.addAction("Copy message")
+        if menu.exec(self.chat_view.viewport().mapToGlobal(pos)) == copy_action:
+            QApplication.clipboard().setText(index.data())
 
     def add_ai_response(self, content: str) -> None:
         """Public method for workers to push AI responses."""
@@ -204,19 +459,13 @@ class AISidebar(QWidget):
             self.input_box.setPlainText(prompt)
             self.input_box.setFocus()
         elif action == "save_to_notes":
-            # Signal the manage view to save to notes
-            main_win = self.window()
-            if hasattr(main_win, "manage_view"):
-                editor = main_win.manage_view.notes_editor
-                current = editor.toPlainText()
-                separator = "\n\n---\n\n" if current else ""
-                editor.setPlainText(current + separator + text)
-                self._add_bubble("assistant", "Text saved to your notes.")
+            # The main window routes this to the manage view's notes editor
+            self.save_to_notes.emit(text)
+            self._add_bubble("assistant", "Text saved to your notes.")
 
     def _clear_chat(self) -> None:
         """Clear all chat bubbles."""
-        while self.chat_layout.count():
-            child = self.chat_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        self._add_bubble("assistant", "Chat cleared. How can I help?")
+        self.chat_model.reset([("assistant", "Chat cleared. How can I help?")])
+        self.chat_view.scrollToTop()
+        if self._chat_handler is not None:
+            self._chat_handler.clear_history()
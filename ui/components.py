@@ -3,52 +3,57 @@ PaperMiner - Reusable UI Components
 Shared widgets: NavigationButton, CollapsibleSection, SearchBar, etc.
 """
 
+from functools import lru_cache
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
-    QLineEdit, QFrame, QSizePolicy,
+    QLineEdit, QFrame, QSizePolicy, QCompleter,
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QTimer, QDir
 from PyQt6.QtGui import QIcon, QFont
 
+from config import RESOURCES_DIR
+
+# Themed icons resolve as "icons:<name>.svg"
+QDir.addSearchPath("icons", str(RESOURCES_DIR / "icons"))
+NAV_ICON_SIZE = QSize(18, 18)
+
+# Typing pause before SearchBar reports the query (ms)
+SEARCH_DEBOUNCE_MS = 150
+
+
+@lru_cache(maxsize=None)
+def load_icon(name: str) -> QIcon:
+    """Icon from resources/icons, read once per name; QIcon then caches its rendered sizes."""
+    return QIcon(f"icons:{name}.svg")
+
 
 class NavButton(QPushButton):
     """A sidebar navigation button with icon + label, toggleable active state."""
 
-    def __init__(self, text: str, icon_char: str = "", parent: QWidget = None) -> None:
+    def __init__(self, text: str, icon_char: str = "", parent: QWidget = None,
+                 icon_name: str = "") -> None:
         super().__init__(parent)
-        self.setText(f"  {icon_char}  {text}" if icon_char else f"  {text}")
+        icon = load_icon(icon_name) if icon_name else None
+        if icon is not None and not icon.isNull():
+            self.setIcon(icon)
+            self.setIconSize(NAV_ICON_SIZE)
+            self.setText(f"  {text}")
+        else:
+            self.setText(f"  {icon_char}  {text}" if icon_char else f"  {text}")
         self.setCheckable(True)
         self.setFixedHeight(44)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         font = QFont()
         font.setPointSize(11)
         self.setFont(font)
-        self.setStyleSheet(self._style())
-
-    @staticmethod
-    def _style() -> str:
-        return """
-            QPushButton {
-                text-align: left;
-                border: none;
-                border-radius: 6px;
-                padding-left: 12px;
-                color: #D4D4D4;
-                background: transparent;
-            }
-            QPushButton:hover {
-                background: #2A2D2E;
-            }
-            QPushButton:checked {
-                background: #37373D;
-                color: #FFFFFF;
-                font-weight: bold;
-            }
-        """
 
 
 class SearchBar(QWidget):
-    """A search bar with a clear button, emitting textChanged signal."""
+    """
+    A search bar with a clear button, emitting textChanged signal.
+    User typing is debounced; Enter and the clear button report immediately.
+    """
     textChanged = pyqtSignal(str)
 
     def __init__(self, placeholder: str = "Search...", parent: QWidget = None) -> None:
@@ -58,34 +63,41 @@ class SearchBar(QWidget):
 
         self.input = QLineEdit()
         self.input.setPlaceholderText(placeholder)
-        self.input.setStyleSheet("""
-            QLineEdit {
-                border: 1px solid #3C3C3C;
-                border-radius: 6px;
-                padding: 6px 10px;
-                background: #1E1E1E;
-                color: #CCCCCC;
-                font-size: 13px;
-            }
-            QLineEdit:focus { border-color: #007ACC; }
-        """)
-        self.input.textChanged.connect(self.textChanged.emit)
         layout.addWidget(self.input)
 
+        # textEdited fires for user input only, so programmatic setText/clear is not re-queried
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(SEARCH_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._emit_text)
+        self.input.textEdited.connect(self._debounce.start)
+        self.input.returnPressed.connect(self._emit_text)
+
         self.btn_clear = QPushButton("✕")
         self.btn_clear.setFixedSize(28, 28)
-        self.btn_clear.setStyleSheet("""
-            QPushButton {
-                border: none; background: transparent; color: #808080; font-size: 14px;
-            }
-            QPushButton:hover { color: #FFFFFF; }
-        """)
-        self.btn_clear.clicked.connect(lambda: self.input.clear())
+        self.btn_clear.clicked.connect(self._on_clear)
         layout.addWidget(self.btn_clear)
 
+    def _emit_text(self) -> None:
+        self._debounce.stop()
+        self.textChanged.emit(self.input.text())
+
+    def _on_clear(self) -> None:
+        self.input.clear()
+        self._emit_text()
+
     def text(self) -> str:
         return self.input.text()
 
+    def setCompleter(self, completer: QCompleter) -> None:
+        """Attach a completer; picking a suggestion searches for it right away."""
+        self.input.setCompleter(completer)
+        completer.activated.connect(self._on_completion)
+
+    def _on_completion(self, text: str) -> None:
+        self.input.setText(text)
+        self._emit_text()
+
 
 class Separator(QFrame):
     """A horizontal line separator."""
@@ -93,7 +105,6 @@ class Separator(QFrame):
     def __init__(self, parent: QWidget = None) -> None:
         super().__init__(parent)
         self.setFrameShape(QFrame.Shape.HLine)
-        self.setStyleSheet("color: #3C3C3C;")
         self.setFixedHeight(1)
 
 
@@ -102,16 +113,6 @@ class SectionHeader(QLabel):
 
     def __init__(self, text: str, parent: QWidget = None) -> None:
         super().__init__(text, parent)
-        self.setStyleSheet("""
-            QLabel {
-                color: #9CDCFE;
-                font-size: 11px;
-                font-weight: bold;
-                padding: 8px 12px 4px 12px;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }
-        """)
 
 
 GLOBAL_STYLESHEET = """
@@ -124,7 +125,7 @@ GLOBAL_STYLESHEET = """
         background-color: #3C3C3C;
         width: 1px;
     }
-    QTableWidget {
+    QTableView {
         background-color: #1E1E1E;
         alternate-background-color: #252526;
         border: 1px solid #3C3C3C;
@@ -134,7 +135,7 @@ GLOBAL_STYLESHEET = """
         selection-color: #FFFFFF;
         font-size: 13px;
     }
-    QTableWidget::item { padding: 4px; }
+    QTableView::item { padding: 4px; }
     QHeaderView::section {
         background-color: #252526;
         color: #D4D4D4;
@@ -171,7 +172,7 @@ GLOBAL_STYLESHEET = """
     QPushButton:hover { background-color: #1177BB; }
     QPushButton:pressed { background-color: #094771; }
     QPushButton:disabled { background-color: #3C3C3C; color: #6C6C6C; }
-    QTextEdit {
+    QTextEdit, QPlainTextEdit {
         background-color: #1E1E1E;
         color: #D4D4D4;
         border: 1px solid #3C3C3C;
@@ -179,7 +180,7 @@ GLOBAL_STYLESHEET = """
         font-size: 13px;
         padding: 6px;
     }
-    QTextEdit:focus { border-color: #007ACC; }
+    QTextEdit:focus, QPlainTextEdit:focus { border-color: #007ACC; }
     QStatusBar {
         background-color: #007ACC;
         color: #FFFFFF;
@@ -200,4 +201,108 @@ GLOBAL_STYLESHEET = """
     }
     QScrollBar::handle:vertical:hover { background: #4F4F4F; }
     QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0; }
+
+    /* Shared components (selectors match the Python class names) */
+    NavButton {
+        text-align: left;
+        border: none;
+        border-radius: 6px;
+        padding-left: 12px;
+        color: #D4D4D4;
+        background: transparent;
+    }
+    NavButton:hover { background: #2A2D2E; }
+    NavButton:checked {
+        background: #37373D;
+        color: #FFFFFF;
+        font-weight: bold;
+    }
+    SearchBar QLineEdit {
+        border: 1px solid #3C3C3C;
+        border-radius: 6px;
+        padding: 6px 10px;
+        background: #1E1E1E;
+        color: #CCCCCC;
+        font-size: 13px;
+    }
+    SearchBar QLineEdit:focus { border-color: #007ACC; }
+    SearchBar QPushButton {
+        border: none; background: transparent; color: #808080; font-size: 14px;
+    }
+    SearchBar QPushButton:hover { color: #FFFFFF; }
+    Separator { color: #3C3C3C; }
+    SectionHeader {
+        color: #9CDCFE;
+        font-size: 11px;
+        font-weight: bold;
+        padding: 8px 12px 4px 12px;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+    }
+
+    /* Main window navigation bar */
+    QWidget#navBar { background-color: #252526; }
+    QWidget#navBar QLabel, QWidget#navBar Separator { background: transparent; }
+    QLabel#appTitle {
+        color: #569CD6;
+        font-size: 16px;
+        font-weight: bold;
+        padding: 8px 4px 16px 4px;
+    }
+
+    /* Mine view */
+    QLabel#mineHeader {
+        color: #569CD6; font-size: 20px; font-weight: bold; padding-bottom: 8px;
+    }
+    QGroupBox#searchGroup {
+        border: 1px solid #3C3C3C; border-radius: 6px;
+        margin-top: 8px; padding-top: 16px;
+        color: #9CDCFE; font-weight: bold;
+    }
+    QComboBox#sourceSelector {
+        background: #3C3C3C; color: #D4D4D4; border: 1px solid #555;
+        border-radius: 4px; padding: 6px 8px;
+    }
+    QLineEdit#keywordInput {
+        background: #1E1E1E; color: #D4D4D4; border: 1px solid #3C3C3C;
+        border-radius: 6px; padding: 8px 12px; font-size: 14px;
+    }
+    QLineEdit#keywordInput:focus { border-color: #007ACC; }
+
+    /* Library reader */
+    QLabel#readerPlaceholder { color: #808080; font-size: 14px; }
+
+    /* PDF viewer toolbar */
+    QPushButton#pageLabel { color: #808080; border: none; font-size: 12px; }
+
+    /* AI sidebar */
+    QWidget#aiHeader { background-color: #252526; border-bottom: 1px solid #3C3C3C; }
+    QWidget#aiHeader QLabel { background: transparent; }
+    QLabel#aiTitle { color: #569CD6; font-size: 14px; font-weight: bold; }
+    QComboBox#modeSelector {
+        background: #3C3C3C; color: #D4D4D4; border: 1px solid #555;
+        border-radius: 4px; padding: 4px 8px; font-size: 12px;
+    }
+    QComboBox#modeSelector::drop-down { border: none; }
+    QComboBox#modeSelector QAbstractItemView {
+        background: #252526; color: #D4D4D4; selection-background-color: #094771;
+    }
+    QListView#chatView { border: none; background: #1E1E1E; padding: 8px; }
+    QWidget#aiInputBar { background-color: #252526; border-top: 1px solid #3C3C3C; }
+    QPlainTextEdit#chatInput {
+        background: #1E1E1E; color: #D4D4D4;
+        border: 1px solid #3C3C3C; border-radius: 6px;
+        padding: 6px; font-size: 13px;
+    }
+    QPlainTextEdit#chatInput:focus { border-color: #007ACC; }
+    QPushButton#btnSend {
+        background: #0E639C; color: white; border: none;
+        border-radius: 4px; padding: 6px 20px; font-size: 13px;
+    }
+    QPushButton#btnSend:hover { background: #1177BB; }
+    QPushButton#btnClear {
+        background: transparent; color: #808080; border: 1px solid #3C3C3C;
+        border-radius: 4px; padding: 6px 12px; font-size: 12px;
+    }
+    QPushButton#btnClear:hover { color: #D4D4D4; border-color: #555; }
 """
@@ -5,13 +5,13 @@ plus a collapsible AI chat sidebar on the right.
 """
 
 import logging
-from typing import Optional
+from typing import Callable, Dict, Optional, Tuple
 
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QStackedWidget,
+    QMainWindow, QWidget, QVBoxLayout, QStackedWidget,
     QSplitter, QStatusBar, QLabel, QSizePolicy, QApplication,
 )
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QTimer
 
 from config import settings, DB_PATH
 from core.database import DatabaseManager
@@ -42,6 +42,12 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("PaperMiner Ready")
+        # showMessage repaints synchronously; show_status defers to one paint per event-loop pass
+        self._pending_status: Optional[Tuple[str, int]] = None
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(0)
+        self._status_timer.timeout.connect(self._flush_status)
 
         # Build UI
         self._init_ui()
@@ -49,48 +55,77 @@ class MainWindow(QMainWindow):
         # Default to Manage view
         self._switch_view(0)
 
+        # Import heavy AI/PDF modules and start the PDF viewer once the event loop is running (after first paint)
+        self._prewarm_worker = None
+        QTimer.singleShot(0, self._prewarm)
+
     def _init_ui(self) -> None:
-        """Construct the three-column layout: NavBar | Content | AI Sidebar."""
-        central = QWidget()
-        self.setCentralWidget(central)
-        root_layout = QHBoxLayout(central)
-        root_layout.setContentsMargins(0, 0, 0, 0)
-        root_layout.setSpacing(0)
+        """Construct the three-column splitter: NavBar | Content | AI Sidebar."""
+        # One splitter hosts every column; its 1px handles draw the separators
+        self.main_splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.main_splitter.setHandleWidth(1)
+        self.setCentralWidget(self.main_splitter)
 
         # --- 1. Left Navigation Bar (fixed width) ---
         self.nav_bar = self._build_nav_bar()
-        root_layout.addWidget(self.nav_bar)
+        self.main_splitter.addWidget(self.nav_bar)
+        self.main_splitter.setCollapsible(0, False)
+        self.main_splitter.setStretchFactor(0, 0)
 
         # --- 2. Main Content Area (QStackedWidget) ---
+        # Views are built the first time they are shown (see _view)
         self.content_stack = QStackedWidget()
+        self._view_factories: Dict[int, Callable[[], QWidget]] = {
+            0: lambda: ManageView(self.db, self),
+            1: lambda: MineView(self.db, self),
+        }
+        self._views: Dict[int, QWidget] = {}
 
-        self.manage_view = ManageView(self.db, self)
-        self.mine_view = MineView(self.db, self)
+        # --- 3. AI Sidebar (collapsible, built on first toggle) ---
+        self.ai_sidebar: Optional[AISidebar] = None
 
-        self.content_stack.addWidget(self.manage_view)   # index 0
-        self.content_stack.addWidget(self.mine_view)     # index 1
-
-        # --- 3. AI Sidebar (collapsible) ---
-        self.ai_sidebar = AISidebar(self.db, self)
-
-        # Use a splitter for content + AI sidebar
-        self.main_splitter = QSplitter(Qt.Orientation.Horizontal)
-        self.main_splitter.setHandleWidth(1)
         self.main_splitter.addWidget(self.content_stack)
-        self.main_splitter.addWidget(self.ai_sidebar)
-        self.main_splitter.setStretchFactor(0, 4)
-        self.main_splitter.setStretchFactor(1, 1)
-
-        # Start with AI sidebar collapsed
-        self.ai_sidebar.setVisible(False)
-
-        root_layout.addWidget(self.main_splitter, stretch=1)
+        self.main_splitter.setStretchFactor(1, 4)
+        self.main_splitter.handle(1).setEnabled(False)  # the nav bar has a fixed width
+
+    def _view(self, index: int) -> QWidget:
+        """Return the content view for `index`, constructing it on first use."""
+        view = self._views.get(index)
+        if view is None:
+            view = self._view_factories[index]()
+            self.content_stack.addWidget(view)
+            self._views[index] = view
+        return view
+
+    @property
+    def manage_view(self) -> ManageView:
+        return self._view(0)
+
+    @property
+    def mine_view(self) -> MineView:
+        return self._view(1)
+
+    def _ensure_ai_sidebar(self) -> AISidebar:
+        if self.ai_sidebar is None:
+            self.ai_sidebar = AISidebar(self.db, self)
+            self.ai_sidebar.save_to_notes.connect(self._append_note)
+            self.ai_sidebar.setVisible(False)
+            self.main_splitter.addWidget(self.ai_sidebar)
+            self.main_splitter.setStretchFactor(2, 1)
+        return self.ai_sidebar
+
+    def _append_note(self, text: str) -> None:
+        """Append text from the AI sidebar to the open paper's notes."""
+        editor = self.manage_view.notes_editor
+        current = editor.toPlainText()
+        separator = "\n\n---\n\n" if current else ""
+        editor.setPlainText(current + separator + text)
 
     def _build_nav_bar(self) -> QWidget:
         """Build the fixed-width left sidebar with navigation buttons."""
         nav = QWidget()
         nav.setFixedWidth(200)
-        nav.setStyleSheet("background-color: #252526; border-right: 1px solid #3C3C3C;")
+        nav.setObjectName("navBar")
 
         layout = QVBoxLayout(nav)
         layout.setContentsMargins(8, 12, 8, 12)
@@ -98,24 +133,17 @@ class MainWindow(QMainWindow):
 
         # App title
         title = QLabel("📘 PaperMiner")
-        title.setStyleSheet("""
-            QLabel {
-                color: #569CD6;
-                font-size: 16px;
-                font-weight: bold;
-                padding: 8px 4px 16px 4px;
-            }
-        """)
+        title.setObjectName("appTitle")
         layout.addWidget(title)
 
         # Navigation section
         layout.addWidget(SectionHeader("WORKSPACE"))
 
-        self.btn_manage = NavButton("Manage Papers", "📚")
+        self.btn_manage = NavButton("Manage Papers", "📚", icon_name="manage")
         self.btn_manage.setChecked(True)
         self.btn_manage.clicked.connect(lambda: self._switch_view(0))
 
-        self.btn_mine = NavButton("Mine Papers", "🔍")
+        self.btn_mine = NavButton("Mine Papers", "🔍", icon_name="mine")
         self.btn_mine.clicked.connect(lambda: self._switch_view(1))
 
         layout.addWidget(self.btn_manage)
@@ -124,7 +152,7 @@ class MainWindow(QMainWindow):
         layout.addWidget(Separator())
         layout.addWidget(SectionHeader("TOOLS"))
 
-        self.btn_ai_toggle = NavButton("AI Assistant", "🤖")
+        self.btn_ai_toggle = NavButton("AI Assistant", "🤖", icon_name="ai")
         self.btn_ai_toggle.setCheckable(True)
         self.btn_ai_toggle.clicked.connect(self._toggle_ai_sidebar)
         layout.addWidget(self.btn_ai_toggle)
@@ -134,34 +162,43 @@ class MainWindow(QMainWindow):
 
         # Settings button at bottom
         layout.addWidget(Separator())
-        self.btn_settings = NavButton("Settings", "⚙️")
+        self.btn_settings = NavButton("Settings", "⚙️", icon_name="settings")
         self.btn_settings.clicked.connect(self._open_settings)
         layout.addWidget(self.btn_settings)
 
         return nav
 
+    def _prewarm(self) -> None:
+        """Start background imports of fitz/numpy/httpx and the RAG modules, and load PDF.js."""
+        from workers.async_workers import PrewarmWorker
+        self._prewarm_worker = PrewarmWorker(self)
+        self._prewarm_worker.start()
+        self.manage_view.prewarm_reader()
+
     def _switch_view(self, index: int) -> None:
         """Switch the stacked widget to the given view index."""
-        self.content_stack.setCurrentIndex(index)
+        self.content_stack.setCurrentWidget(self._view(index))
 
         # Update button states
         self.btn_manage.setChecked(index == 0)
         self.btn_mine.setChecked(index == 1)
 
         view_names = {0: "Manage Papers", 1: "Mine Papers"}
-        self.status_bar.showMessage(f"View: {view_names.get(index, 'Unknown')}")
+        self.show_status(f"View: {view_names.get(index, 'Unknown')}", 0)
         logger.info(f"Switched to view: {view_names.get(index)}")
 
     def _toggle_ai_sidebar(self) -> None:
         """Show or hide the AI chat sidebar."""
-        visible = not self.ai_sidebar.isVisible()
-        self.ai_sidebar.setVisible(visible)
+        sidebar = self._ensure_ai_sidebar()
+        visible = not sidebar.isVisible()
+        sidebar.setVisible(visible)
         self.btn_ai_toggle.setChecked(visible)
 
         if visible:
-            # Restore splitter sizes: ~75% content, ~25% AI
-            total = self.main_splitter.width()
-            self.main_splitter.setSizes([int(total * 0.75), int(total * 0.25)])
+            # Restore splitter sizes: ~75% content, ~25% AI (beside the fixed nav bar)
+            nav = self.nav_bar.width()
+            total = self.main_splitter.width() - nav
+            self.main_splitter.setSizes([nav, int(total * 0.75), int(total * 0.25)])
 
         logger.info(f"AI Sidebar visible: {visible}")
 
@@ -175,17 +212,28 @@ class MainWindow(QMainWindow):
         )
 
     def show_status(self, message: str, timeout: int = 3000) -> None:
-        """Convenience method for child widgets to update status bar."""
-        self.status_bar.showMessage(message, timeout)
+        """Convenience method for child widgets to update status bar (last message per burst wins)."""
+        self._pending_status = (message, timeout)
+        self._status_timer.start()
+
+    def _flush_status(self) -> None:
+        if self._pending_status is not None:
+            self.status_bar.showMessage(*self._pending_status)
+            self._pending_status = None
 
     def open_ai_with_context(self, context_text: str, action: str = "explain") -> None:
         """Open the AI sidebar with pre-filled context (for contextual actions)."""
-        if not self.ai_sidebar.isVisible():
+        if self.ai_sidebar is None or not self.ai_sidebar.isVisible():
             self._toggle_ai_sidebar()
         self.ai_sidebar.set_context(context_text, action)
 
     def closeEvent(self, event) -> None:
         """Clean up resources on exit."""
+        if self._prewarm_worker is not None:
+            self._prewarm_worker.wait()
+        manage_view = self._views.get(0)
+        if manage_view is not None:
+            manage_view.flush_note()
         self.db.close()
         settings.save()
         logger.info("Application closed.")
@@ -4,27 +4,114 @@ The paper library management view: folder sidebar, paper list, PDF reader, and n
 """
 
 import os
-import shutil
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QListWidget,
-    QTableWidget, QTableWidgetItem, QPushButton, QLabel, QFileDialog,
-    QInputDialog, QMessageBox, QTextEdit, QHeaderView, QMenu, QListWidgetItem,
-    QMainWindow,
+    QTableView, QAbstractItemView, QPushButton, QLabel, QFileDialog,
+    QInputDialog, QMessageBox, QPlainTextEdit, QHeaderView, QMenu, QListWidgetItem,
+    QMainWindow, QCompleter, QStackedWidget,
+)
+from PyQt6.QtCore import (
+    Qt, QPoint, QAbstractTableModel, QModelIndex, QStringListModel, QThreadPool, QTimer,
 )
-from PyQt6.QtCore import Qt, QPoint
 
 from config import LIBRARY_DIR
 from core.database import DatabaseManager
 from core.models import Paper
-from ui.pdf_viewer import PDFViewerWidget
 from ui.components import SectionHeader, SearchBar
+from workers.async_workers import CopyWorker
+
+if TYPE_CHECKING:
+    from ui.pdf_viewer import PDFViewerWidget
 
 logger = logging.getLogger(__name__)
 
+# Folder items keep the bare name and paper count beside the "📁 name (n)" label
+_FOLDER_NAME_ROLE = Qt.ItemDataRole.UserRole + 1
+_FOLDER_COUNT_ROLE = Qt.ItemDataRole.UserRole + 2
+
+NOTE_SAVE_DELAY_MS = 500  # idle time after the last keystroke before a note is written
+NOTE_CACHE_SIZE = 128     # notes kept in memory for switching back and forth between papers
+
+
+class PaperTableModel(QAbstractTableModel):
+    """Paper list backing the library table; cells are read from the Paper objects on demand.
+
+    Folder listings are loaded PAGE_SIZE rows at a time: the view asks for the next
+    page through canFetchMore/fetchMore as it scrolls towards the end.
+    """
+
+    HEADERS = ("Title", "Date", "Indexed")
+    PAGE_SIZE = 100
+
+    def __init__(self, db: DatabaseManager, parent: QWidget = None) -> None:
+        super().__init__(parent)
+        self._db = db
+        self._papers: List[Paper] = []
+        self._folder_id: Optional[int] = None
+        self._total = 0
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._papers)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        paper = self._papers[index.row()]
+        column = index.column()
+        if column == 0:
+            return paper.title
+        if column == 1:
+            return paper.upload_date
+        return "✅" if paper.is_indexed else "—"
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and len(self._papers) < self._total
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if not self.canFetchMore(parent):
+            return
+        loaded = len(self._papers)
+        page = self._db.get_papers_by_folder(self._folder_id, self.PAGE_SIZE, loaded)
+        if not page:
+            # Papers were removed since the count was taken
+            self._total = loaded
+            return
+        self.beginInsertRows(QModelIndex(), loaded, loaded + len(page) - 1)
+        self._papers.extend(page)
+        self.endInsertRows()
+
+    def load_folder(self, folder_id: Optional[int]) -> None:
+        """Show a folder (None = all papers), loading only its first page."""
+        self.beginResetModel()
+        self._folder_id = folder_id
+        self._total = self._db.count_papers(folder_id)
+        self._papers = self._db.get_papers_by_folder(folder_id, self.PAGE_SIZE)
+        self.endResetModel()
+
+    def set_papers(self, papers: List[Paper]) -> None:
+        """Show a fixed list (e.g. search results); nothing further to fetch."""
+        self.beginResetModel()
+        self._papers = papers
+        self._total = len(papers)
+        self.endResetModel()
+
+    def paper_at(self, row: int) -> Paper:
+        return self._papers[row]
+
 
 class ManageView(QWidget):
     """Complete library management view with folders, paper list, reader, and notes."""
@@ -35,6 +122,8 @@ class ManageView(QWidget):
         self.main_window = main_window
         self.current_folder_id: Optional[int] = None
         self.current_paper_id: Optional[int] = None
+        self._folder_items: Dict[int, QListWidgetItem] = {}
+        self._note_cache: "OrderedDict[int, str]" = OrderedDict()
 
         self._init_ui()
         self._load_folders()
@@ -99,36 +188,50 @@ class ManageView(QWidget):
         # Search bar
         self.search_bar = SearchBar("Search papers...")
         self.search_bar.textChanged.connect(self._on_search)
+        # Title suggestions are filtered in memory; the table search still hits the DB
+        self._title_model = QStringListModel(self.db.get_paper_titles(), self)
+        completer = QCompleter(self._title_model, self)
+        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        completer.setFilterMode(Qt.MatchFlag.MatchContains)
+        self.search_bar.setCompleter(completer)
         layout.addWidget(self.search_bar)
 
         # Paper table
-        self.paper_table = QTableWidget(0, 3)
-        self.paper_table.setHorizontalHeaderLabels(["Title", "Date", "Indexed"])
+        self.paper_model = PaperTableModel(self.db, self)
+        self.paper_table = QTableView()
+        self.paper_table.setModel(self.paper_model)
         self.paper_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.paper_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.paper_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
-        self.paper_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.paper_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        # Date/Indexed cells are fixed-width, so size them from the visible rows only
+        # instead of measuring up to 1000 rows on every reset or page fetch
+        self.paper_table.horizontalHeader().setResizeContentsPrecision(0)
+        self.paper_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.paper_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.paper_table.setAlternatingRowColors(True)
-        self.paper_table.cellClicked.connect(self._on_paper_selected)
+        self.paper_table.clicked.connect(self._on_paper_selected)
         self.paper_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.paper_table.customContextMenuRequested.connect(self._paper_context_menu)
+        self.paper_table.verticalScrollBar().valueChanged.connect(self._on_paper_scroll)
         layout.addWidget(self.paper_table)
 
         # Upload button
-        btn_upload = QPushButton("📄 Upload PDF")
-        btn_upload.clicked.connect(self._upload_paper)
-        layout.addWidget(btn_upload)
+        self.btn_upload = QPushButton("📄 Upload PDF")
+        self.btn_upload.clicked.connect(self._upload_paper)
+        layout.addWidget(self.btn_upload)
 
         return w
 
     def _build_reader_panel(self) -> QWidget:
         reader_splitter = QSplitter(Qt.Orientation.Vertical)
 
-        # PDF Viewer (PDF.js via QWebChannel)
-        self.pdf_viewer = PDFViewerWidget(self.db, self)
-        self.pdf_viewer.text_selected.connect(self._on_text_selected)
-        self.pdf_viewer.annotation_saved.connect(self._on_annotation_saved)
+        # PDF Viewer (PDF.js via QWebChannel), built when the first paper is opened
+        self.pdf_viewer: Optional["PDFViewerWidget"] = None
+        self.reader_stack = QStackedWidget()
+        placeholder = QLabel("Select a paper to start reading")
+        placeholder.setObjectName("readerPlaceholder")
+        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.reader_stack.addWidget(placeholder)
 
         # Notes panel
         notes_widget = QWidget()
@@ -136,36 +239,97 @@ class ManageView(QWidget):
         notes_layout.setContentsMargins(8, 4, 8, 8)
         notes_layout.addWidget(SectionHeader("📝 NOTES"))
 
-        self.notes_editor = QTextEdit()
+        # Notes are stored as plain text; QPlainTextEdit lays out only the visible blocks
+        self.notes_editor = QPlainTextEdit()
         self.notes_editor.setPlaceholderText("Capture your thoughts here...")
         self.notes_editor.textChanged.connect(self._auto_save_note)
+        self._note_save_timer = QTimer(self)
+        self._note_save_timer.setSingleShot(True)
+        self._note_save_timer.setInterval(NOTE_SAVE_DELAY_MS)
+        self._note_save_timer.timeout.connect(self.flush_note)
         notes_layout.addWidget(self.notes_editor)
 
-        reader_splitter.addWidget(self.pdf_viewer)
+        reader_splitter.addWidget(self.reader_stack)
         reader_splitter.addWidget(notes_widget)
         reader_splitter.setStretchFactor(0, 4)
         reader_splitter.setStretchFactor(1, 1)
+        reader_splitter.setSizes([800, 200])  # the placeholder has no size hint to split by
 
         return reader_splitter
 
+    def _ensure_pdf_viewer(self) -> "PDFViewerWidget":
+        if self.pdf_viewer is None:
+            # QtWebEngine is only imported and started by prewarm_reader or the first opened paper
+            from ui.pdf_viewer import PDFViewerWidget
+
+            self.pdf_viewer = PDFViewerWidget(self.db, self)
+            self.pdf_viewer.text_selected.connect(self._on_text_selected)
+            self.pdf_viewer.annotation_saved.connect(self._on_annotation_saved)
+            self.reader_stack.addWidget(self.pdf_viewer)
+        return self.pdf_viewer
+
+    def prewarm_reader(self) -> None:
+        """Build the hidden PDF viewer and load PDF.js, so the first paper opens without a page load."""
+        self._ensure_pdf_viewer().prewarm()
+
     # ---- Folder Logic ----
 
     def _load_folders(self) -> None:
+        """Build the folder list once; later edits patch single items (_insert_folder_item)."""
         self.folder_list.clear()
+        self._folder_items.clear()
         all_item = QListWidgetItem("📂 All Papers")
         all_item.setData(Qt.ItemDataRole.UserRole, None)
         self.folder_list.addItem(all_item)
 
-        for f in self.db.get_folders():
-            item = QListWidgetItem(f"📁 {f.name}")
+        counts = self.db.get_folder_counts()
+        for f in self.db.get_folders():  # already ordered by name
+            item = QListWidgetItem()
             item.setData(Qt.ItemDataRole.UserRole, f.id)
+            self._set_folder_label(item, f.name, counts.get(f.id, 0))
             self.folder_list.addItem(item)
+            self._folder_items[f.id] = item
+
+    @staticmethod
+    def _set_folder_label(item: QListWidgetItem, name: str, count: int) -> None:
+        item.setData(_FOLDER_NAME_ROLE, name)
+        item.setData(_FOLDER_COUNT_ROLE, count)
+        item.setText(f"📁 {name} ({count})")
+
+    def _update_folder_counts(self) -> None:
+        """Refresh every folder's paper count with one GROUP BY query."""
+        counts = self.db.get_folder_counts()
+        for folder_id, item in self._folder_items.items():
+            count = counts.get(folder_id, 0)
+            if item.data(_FOLDER_COUNT_ROLE) != count:
+                self._set_folder_label(item, item.data(_FOLDER_NAME_ROLE), count)
+
+    def _insert_folder_item(self, folder_id: int, name: str) -> None:
+        """Add or move a folder's item to its name-sorted position (row 0 is "All Papers")."""
+        item = self._folder_items.pop(folder_id, None)
+        if item is not None:
+            self.folder_list.takeItem(self.folder_list.row(item))
+            self._set_folder_label(item, name, item.data(_FOLDER_COUNT_ROLE))
+        else:
+            item = QListWidgetItem()
+            item.setData(Qt.ItemDataRole.UserRole, folder_id)
+            self._set_folder_label(item, name, 0)
+
+        count = self.folder_list.count()
+        row = next(
+            (r for r in range(1, count)
+             if self.folder_list.item(r).data(_FOLDER_NAME_ROLE) > name),
+            count,
+        )
+        self.folder_list.insertItem(row, item)
+        self._folder_items[folder_id] = item
 
     def _add_new_folder(self) -> None:
         name, ok = QInputDialog.getText(self, "New Folder", "Folder Name:")
         if ok and name.strip():
-            if self.db.add_folder(name.strip()):
-                self._load_folders()
+            folder_id = self.db.add_folder(name.strip())
+            if folder_id is not None:
+                self._insert_folder_item(folder_id, name.strip())
                 self.main_window.show_status(f"Folder '{name}' created.")
             else:
                 QMessageBox.warning(self, "Error", "Folder already exists!")
@@ -190,8 +354,10 @@ class ManageView(QWidget):
         if action == rename_action:
             new_name, ok = QInputDialog.getText(self, "Rename Folder", "New Name:")
             if ok and new_name.strip():
-                self.db.rename_folder(folder_id, new_name.strip())
-                self._load_folders()
+                if self.db.rename_folder(folder_id, new_name.strip()):
+                    self._insert_folder_item(folder_id, new_name.strip())
+                else:
+                    QMessageBox.warning(self, "Error", "Folder already exists!")
         elif action == delete_action:
             confirm = QMessageBox.question(
                 self, "Delete Folder",
@@ -199,120 +365,146 @@ class ManageView(QWidget):
             )
             if confirm == QMessageBox.StandardButton.Yes:
                 self.db.delete_folder(folder_id)
-                self._load_folders()
+                item = self._folder_items.pop(folder_id)
+                self.folder_list.takeItem(self.folder_list.row(item))
                 self._refresh_paper_list()
 
     # ---- Paper Logic ----
 
     def _refresh_paper_list(self) -> None:
-        self.paper_table.setRowCount(0)
-        papers = self.db.get_papers_by_folder(self.current_folder_id)
-        for p in papers:
-            row = self.paper_table.rowCount()
-            self.paper_table.insertRow(row)
-
-            title_item = QTableWidgetItem(p.title)
-            title_item.setData(Qt.ItemDataRole.UserRole, p)
-            self.paper_table.setItem(row, 0, title_item)
-            self.paper_table.setItem(row, 1, QTableWidgetItem(p.upload_date))
-            self.paper_table.setItem(row, 2, QTableWidgetItem("✅" if p.is_indexed else "—"))
+        self.paper_model.load_folder(self.current_folder_id)
+
+    def _on_paper_scroll(self, value: int) -> None:
+        # Fetch the next page a screenful before the end so scrolling does not stall
+        bar = self.paper_table.verticalScrollBar()
+        if value >= bar.maximum() - bar.pageStep() and self.paper_model.canFetchMore():
+            self.paper_model.fetchMore()
 
     def _on_search(self, keyword: str) -> None:
         if not keyword.strip():
             self._refresh_paper_list()
             return
-        self.paper_table.setRowCount(0)
-        papers = self.db.search_papers(keyword.strip())
-        for p in papers:
-            row = self.paper_table.rowCount()
-            self.paper_table.insertRow(row)
-            title_item = QTableWidgetItem(p.title)
-            title_item.setData(Qt.ItemDataRole.UserRole, p)
-            self.paper_table.setItem(row, 0, title_item)
-            self.paper_table.setItem(row, 1, QTableWidgetItem(p.upload_date))
-            self.paper_table.setItem(row, 2, QTableWidgetItem("✅" if p.is_indexed else "—"))
-
-    def _on_paper_selected(self, row: int, column: int) -> None:
-        item = self.paper_table.item(row, 0)
-        if not item:
+        self.paper_model.set_papers(self.db.search_papers(keyword.strip()))
+
+    def _on_paper_selected(self, index: QModelIndex) -> None:
+        if not index.isValid():
             return
 
-        paper: Paper = item.data(Qt.ItemDataRole.UserRole)
+        paper = self.paper_model.paper_at(index.row())
+        self.flush_note()
         self.current_paper_id = paper.id
         file_path = paper.file_path
 
-        logger.info(f"Loading paper: {paper.title} ({file_path})")
+        logger.info("Loading paper: %s (%s)", paper.title, file_path)
 
         if os.path.exists(file_path):
-            self.pdf_viewer.load_pdf(file_path, paper.id)
+            viewer = self._ensure_pdf_viewer()
+            self.reader_stack.setCurrentWidget(viewer)
+            viewer.load_pdf(file_path, paper.id)
             self.main_window.show_status(f"Opened: {paper.title}")
         else:
             QMessageBox.warning(self, "File Not Found", f"Missing: {file_path}")
 
         # Load notes
-        note_content = self.db.get_note(paper.id)
+        note_content = self._get_note(paper.id)
         self.notes_editor.blockSignals(True)
         self.notes_editor.setPlainText(note_content)
         self.notes_editor.blockSignals(False)
 
     def _paper_context_menu(self, pos: QPoint) -> None:
-        item = self.paper_table.itemAt(pos)
-        if not item:
+        index = self.paper_table.indexAt(pos)
+        if not index.isValid():
             return
-        paper: Paper = self.paper_table.item(item.row(), 0).data(Qt.ItemDataRole.UserRole)
+        paper = self.paper_model.paper_at(index.row())
 
         menu = QMenu(self)
         index_action = menu.addAction("🔗 Index for RAG")
         delete_action = menu.addAction("🗑 Delete")
 
-        action = menu.exec(self.paper_table.mapToGlobal(pos))
+        action = menu.exec(self.paper_table.viewport().mapToGlobal(pos))
         if action == index_action:
             self._index_paper(paper)
         elif action == delete_action:
             confirm = QMessageBox.question(self, "Delete Paper", f"Delete '{paper.title}'?")
             if confirm == QMessageBox.StandardButton.Yes:
+                self.flush_note()
                 self.db.delete_paper(paper.id)
+                self._note_cache.pop(paper.id, None)
                 self._refresh_paper_list()
+                self._update_folder_counts()
+                self._title_model.setStringList(self.db.get_paper_titles())
 
     def _upload_paper(self) -> None:
         if self.current_folder_id is None:
             QMessageBox.information(self, "Info", "Please select a folder first!")
             return
 
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select PDF", "", "PDF Files (*.pdf)")
-        if not file_path:
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Select PDFs", "", "PDF Files (*.pdf)")
+        if not file_paths:
             return
 
-        filename = os.path.basename(file_path)
-        dest_path = LIBRARY_DIR / filename
-        try:
-            shutil.copy2(file_path, dest_path)
-            paper_id = self.db.add_paper(filename, str(dest_path.absolute()), self.current_folder_id)
-            self._refresh_paper_list()
-            self.main_window.show_status(f"Uploaded: {filename}")
-            logger.info(f"Paper uploaded: {filename} -> {dest_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Upload failed: {e}")
-            logger.error(f"Upload failed: {e}")
+        worker = CopyWorker(self.db, file_paths, str(LIBRARY_DIR.absolute()), self.current_folder_id)
+        worker.signals.finished_signal.connect(self._on_upload_finished)
+        worker.signals.error_occurred.connect(self._on_upload_error)
+        self.btn_upload.setEnabled(False)
+        self.main_window.show_status(f"Uploading {len(file_paths)} file(s)...")
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_upload_finished(self, filenames: List[str]) -> None:
+        self.btn_upload.setEnabled(True)
+        self._refresh_paper_list()
+        self._update_folder_counts()
+        self._title_model.setStringList(self.db.get_paper_titles())
+        label = filenames[0] if len(filenames) == 1 else f"{len(filenames)} papers"
+        self.main_window.show_status(f"Uploaded: {label}")
+        logger.info("Papers uploaded: %s", ", ".join(filenames))
+
+    def _on_upload_error(self, message: str) -> None:
+        self.btn_upload.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Upload failed: {message}")
+        logger.error("Upload failed: %s", message)
 
     def _index_paper(self, paper: Paper) -> None:
         """Trigger RAG indexing for a paper (runs in background thread)."""
         # TODO: Connect to workers/async_workers.py → RAG engine
         self.main_window.show_status(f"Indexing '{paper.title}'... (not yet implemented)")
-        logger.info(f"Indexing requested for paper_id={paper.id}")
+        logger.info("Indexing requested for paper_id=%d", paper.id)
 
     # ---- Notes Logic ----
 
     def _auto_save_note(self) -> None:
+        # Restarting the timer coalesces a typing burst into one write
+        if self.current_paper_id:
+            self._note_save_timer.start()
+
+    def flush_note(self) -> None:
+        """Write a pending note edit now (before switching papers or closing)."""
+        if not self._note_save_timer.isActive():
+            return
+        self._note_save_timer.stop()
         if self.current_paper_id:
             content = self.notes_editor.toPlainText()
             self.db.save_note(self.current_paper_id, content)
+            self._cache_note(self.current_paper_id, content)
+
+    def _get_note(self, paper_id: int) -> str:
+        content = self._note_cache.get(paper_id)
+        if content is None:
+            content = self.db.get_note(paper_id)
+        self._cache_note(paper_id, content)
+        return content
+
+    def _cache_note(self, paper_id: int, content: str) -> None:
+        self._note_cache[paper_id] = content
+        self._note_cache.move_to_end(paper_id)
+        if len(self._note_cache) > NOTE_CACHE_SIZE:
+            self._note_cache.popitem(last=False)
 
     # ---- Callbacks from PDF Viewer ----
 
     def _on_text_selected(self, selected_text: str) -> None:
         """Handle text selection in the PDF viewer - show contextual actions."""
-        logger.debug(f"Text selected in PDF: {selected_text[:80]}...")
+        logger.debug("Text selected in PDF: %.80s...", selected_text)
         # The floating menu is handled inside PDFViewerWidget via JS
         # This signal is for potential Python-side usage
 
@@ -4,15 +4,15 @@ Paper discovery dashboard: search ArXiv/HuggingFace, AI recommendation agent.
 """
 
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QLabel,
-    QPushButton, QLineEdit, QTableWidget, QTableWidgetItem,
+    QPushButton, QLineEdit, QTableView, QAbstractItemView,
     QHeaderView, QTextEdit, QComboBox, QGroupBox, QScrollArea,
     QMainWindow,
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
 
 from core.database import DatabaseManager
 from ui.components import SectionHeader, SearchBar
@@ -20,6 +20,42 @@ from ui.components import SectionHeader, SearchBar
 logger = logging.getLogger(__name__)
 
 
+class SearchResultModel(QAbstractTableModel):
+    """Discovery results (dicts from discovery/*_client) shown in the results table."""
+
+    HEADERS = ("Title", "Authors", "Date", "Source")
+    KEYS = ("title", "authors", "date", "source")
+
+    def __init__(self, parent: QWidget = None) -> None:
+        super().__init__(parent)
+        self._results: List[Dict] = []
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._results)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self._results[index.row()].get(self.KEYS[index.column()], "")
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_results(self, results: List[Dict]) -> None:
+        self.beginResetModel()
+        self._results = results
+        self.endResetModel()
+
+    def result_at(self, row: int) -> Dict:
+        return self._results[row]
+
+
 class MineView(QWidget):
     """Paper discovery view with search, source selection, and AI agent."""
 
@@ -36,22 +72,12 @@ class MineView(QWidget):
 
         # Header
         header = QLabel("🔍 Mine Papers — Discover & Explore")
-        header.setStyleSheet("""
-            QLabel {
-                color: #569CD6; font-size: 20px; font-weight: bold; padding-bottom: 8px;
-            }
-        """)
+        header.setObjectName("mineHeader")
         layout.addWidget(header)
 
         # Search controls
         search_group = QGroupBox("Search Parameters")
-        search_group.setStyleSheet("""
-            QGroupBox {
-                border: 1px solid #3C3C3C; border-radius: 6px;
-                margin-top: 8px; padding-top: 16px;
-                color: #9CDCFE; font-weight: bold;
-            }
-        """)
+        search_group.setObjectName("searchGroup")
         sg_layout = QVBoxLayout(search_group)
 
         # Source + keyword row
@@ -60,24 +86,13 @@ class MineView(QWidget):
         self.source_selector = QComboBox()
         self.source_selector.addItems(["ArXiv", "HuggingFace Daily Papers", "Both"])
         self.source_selector.setFixedWidth(200)
-        self.source_selector.setStyleSheet("""
-            QComboBox {
-                background: #3C3C3C; color: #D4D4D4; border: 1px solid #555;
-                border-radius: 4px; padding: 6px 8px;
-            }
-        """)
+        self.source_selector.setObjectName("sourceSelector")
         row1.addWidget(QLabel("Source:"))
         row1.addWidget(self.source_selector)
 
         self.keyword_input = QLineEdit()
         self.keyword_input.setPlaceholderText("Enter keywords: e.g. Transformer, LLM, Diffusion...")
-        self.keyword_input.setStyleSheet("""
-            QLineEdit {
-                background: #1E1E1E; color: #D4D4D4; border: 1px solid #3C3C3C;
-                border-radius: 6px; padding: 8px 12px; font-size: 14px;
-            }
-            QLineEdit:focus { border-color: #007ACC; }
-        """)
+        self.keyword_input.setObjectName("keywordInput")
         row1.addWidget(self.keyword_input, stretch=1)
 
         self.btn_search = QPushButton("🔎 Search")
@@ -114,16 +129,17 @@ class MineView(QWidget):
         results_layout.setContentsMargins(0, 0, 0, 0)
         results_layout.addWidget(SectionHeader("📄 SEARCH RESULTS"))
 
-        self.results_table = QTableWidget(0, 4)
-        self.results_table.setHorizontalHeaderLabels(["Title", "Authors", "Date", "Source"])
+        self.results_model = SearchResultModel(self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
         self.results_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.results_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
         self.results_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.results_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.results_table.setAlternatingRowColors(True)
-        self.results_table.cellClicked.connect(self._on_result_clicked)
+        self.results_table.clicked.connect(self._on_result_clicked)
         results_layout.addWidget(self.results_table)
 
         # Detail panel
@@ -166,28 +182,30 @@ class MineView(QWidget):
         max_results = int(self.max_results.currentText())
 
         self.main_window.show_status(f"Searching {source} for '{keyword}'...")
-        logger.info(f"Search triggered: source={source}, keyword={keyword}, max={max_results}")
+        logger.info(
+            "Search triggered: source=%s, keyword=%s, max=%d", source, keyword, max_results
+        )
 
         # TODO: Connect to workers/async_workers → discovery/arxiv_client, hf_client
         # Placeholder: show mock results
-        self.results_table.setRowCount(0)
-        self.results_table.insertRow(0)
-        self.results_table.setItem(0, 0, QTableWidgetItem(f"[Mock] {keyword} - Sample Paper"))
-        self.results_table.setItem(0, 1, QTableWidgetItem("Author et al."))
-        self.results_table.setItem(0, 2, QTableWidgetItem("2026-02-12"))
-        self.results_table.setItem(0, 3, QTableWidgetItem(source))
+        self.results_model.set_results([{
+            "title": f"[Mock] {keyword} - Sample Paper",
+            "authors": "Author et al.",
+            "date": "2026-02-12",
+            "source": source,
+        }])
 
         self.main_window.show_status(f"Search complete. (Discovery module not yet connected)", 3000)
 
-    def _on_result_clicked(self, row: int, column: int) -> None:
+    def _on_result_clicked(self, index: QModelIndex) -> None:
         """Show details of the selected search result."""
-        title_item = self.results_table.item(row, 0)
-        if not title_item:
+        if not index.isValid():
             return
+        result = self.results_model.result_at(index.row())
         self.detail_view.setHtml(f"""
-            <h3 style="color: #569CD6;">{title_item.text()}</h3>
-            <p style="color: #808080;">Authors: {self.results_table.item(row, 1).text()}</p>
-            <p style="color: #808080;">Date: {self.results_table.item(row, 2).text()}</p>
+            <h3 style="color: #569CD6;">{result.get("title", "")}</h3>
+            <p style="color: #808080;">Authors: {result.get("authors", "")}</p>
+            <p style="color: #808080;">Date: {result.get("date", "")}</p>
             <hr style="border-color: #3C3C3C;">
             <p style="color: #D4D4D4;">Abstract preview will appear here when connected to the search API.</p>
         """)
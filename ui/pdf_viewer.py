@@ -10,17 +10,19 @@ Wraps PDF.js inside QWebEngineView with QWebChannel bridge for:
 import json
 import logging
 import os
+from collections import OrderedDict
+from operator import attrgetter
 from pathlib import Path
 from typing import Optional, List
 from urllib.parse import unquote  # 用于解码 URL 路径
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QMenu,
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QMenu,
 )
-from PyQt6.QtCore import Qt, QUrl, QByteArray, QBuffer, QIODevice, pyqtSignal, pyqtSlot, QObject
+from PyQt6.QtCore import Qt, QUrl, QBuffer, QFile, QIODevice, QTimer, pyqtSignal, pyqtSlot, QObject
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import (
-    QWebEnginePage, QWebEngineSettings, QWebEngineUrlSchemeHandler, QWebEngineProfile, QWebEngineScript
+    QWebEnginePage, QWebEngineSettings, QWebEngineUrlSchemeHandler, QWebEngineProfile
 )
 from PyQt6.QtWebChannel import QWebChannel
 
@@ -30,6 +32,27 @@ from core.models import Annotation
 
 logger = logging.getLogger(__name__)
 
+# Set PAPERMINER_DEVTOOLS=1 to attach a Chromium inspector to the viewer
+DEVTOOLS_ENABLED = bool(os.environ.get("PAPERMINER_DEVTOOLS"))
+_devtools_page: Optional[QWebEnginePage] = None
+
+# Scale factor per click of the zoom buttons
+ZOOM_STEP = 1.1
+
+# Page-label update delay while PDF.js reports pages during a scroll (ms)
+PAGE_LABEL_DELAY_MS = 50
+
+# Fields sent to bridge.js per annotation, in the order its loader expects
+_ANNOTATION_ROW = attrgetter("id", "page", "content", "comment", "color", "rects_json")
+
+
+def _shared_devtools_page() -> QWebEnginePage:
+    """One DevTools page for every viewer; it inspects whichever viewer attached last."""
+    global _devtools_page
+    if _devtools_page is None:
+        _devtools_page = QWebEnginePage(QApplication.instance())
+    return _devtools_page
+
 
 class LocalFileSchemeHandler(QWebEngineUrlSchemeHandler):
     """Custom URL scheme handler for loading local PDF files."""
@@ -54,10 +77,18 @@ class LocalFileSchemeHandler(QWebEngineUrlSchemeHandler):
         ".bcmap": b"application/octet-stream",
     }
 
+    # PDF.js / bridge assets are re-requested every time a PDF is opened; keep their bytes
+    _STATIC_ROOTS = tuple(
+        os.path.join(os.path.normcase(os.path.abspath(d)), "") for d in (PDFJS_DIR, RESOURCES_DIR)
+    )
+    STATIC_CACHE_BYTES = 32 * 1024 * 1024
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        # prevent Python GC from destroying buffers still in use by Chromium
-        self._active_buffers: list = []
+        # prevent Python GC from destroying devices still in use by Chromium
+        self._active_buffers: set = set()
+        self._static_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._static_cache_size = 0
 
     def requestStarted(self, request):
         """Handle requests for local:// URLs."""
@@ -77,35 +108,56 @@ class LocalFileSchemeHandler(QWebEngineUrlSchemeHandler):
         logger.debug(f"LocalFileSchemeHandler: Loading {path}")
 
         try:
-            with open(path, "rb") as f:
-                data = f.read()
-
-            # Determine MIME type
-            ext = os.path.splitext(path)[1].lower()
+            # Determine MIME type (URL paths always use "/"; same result as os.path.splitext)
+            name = path.rpartition("/")[2]
+            dot = name.rfind(".")
+            ext = name[dot:].lower() if dot > 0 else ""
             mime_type = self._MIME_TYPES.get(ext, b"application/octet-stream")
 
-            # Build a self-contained QBuffer
-            buf = QBuffer(request)
-            buf.open(QIODevice.OpenModeFlag.ReadWrite)
-            buf.write(data)
-            buf.seek(0)
+            if ext != ".pdf" and os.path.normcase(os.path.abspath(path)).startswith(self._STATIC_ROOTS):
+                device = QBuffer(request)
+                device.setData(self._read_static(path))
+            else:
+                # Chromium pulls bytes from the device as PDF.js needs them, so the file is
+                # never read whole into memory; the QFile is owned by (and dies with) the request
+                device = QFile(path, request)
+            if not device.open(QIODevice.OpenModeFlag.ReadOnly):
+                raise OSError(device.errorString())
 
             # Hold a Python reference
-            self._active_buffers.append(buf)
-            request.destroyed.connect(lambda b=buf: self._release_buffer(b))
+            self._active_buffers.add(device)
+            request.destroyed.connect(lambda d=device: self._release_buffer(d))
 
-            request.reply(mime_type, buf)
-            logger.debug(f"Successfully loaded {len(data)} bytes from {path}")
+            request.reply(mime_type, device)
+            logger.debug(f"Serving {device.size()} bytes from {path}")
         except Exception as e:
             logger.error(f"Failed to load {path}: {e}")
             request.fail(request.Error.UrlNotFound)
 
+    def _read_static(self, path: str) -> bytes:
+        """Bytes of a viewer asset, from the LRU cache (bounded by STATIC_CACHE_BYTES) when possible."""
+        data = self._static_cache.get(path)
+        if data is not None:
+            self._static_cache.move_to_end(path)
+            return data
+
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) <= self.STATIC_CACHE_BYTES // 8:  # one big asset must not flush the rest
+            self._static_cache[path] = data
+            self._static_cache_size += len(data)
+            while self._static_cache_size > self.STATIC_CACHE_BYTES:
+                _, evicted = self._static_cache.popitem(last=False)
+                self._static_cache_size -= len(evicted)
+        return data
+
+    def clear_static_cache(self) -> None:
+        self._static_cache.clear()
+        self._static_cache_size = 0
+
     def _release_buffer(self, buf):
-        """Remove buffer reference once the request is finished."""
-        try:
-            self._active_buffers.remove(buf)
-        except ValueError:
-            pass
+        """Remove the device reference once the request is finished."""
+        self._active_buffers.discard(buf)
 
 
 class JsBridge(QObject):
@@ -116,8 +168,13 @@ class JsBridge(QObject):
     annotation_request = pyqtSignal(str)         
     context_action = pyqtSignal(str, str)        
     viewer_ready = pyqtSignal()                  
+    bridge_ready = pyqtSignal()                  # PDF.js initialized, with or without a document
     page_changed = pyqtSignal(int)               
     delete_annotation = pyqtSignal(int)          # Signal for deleting annotations               
+    # Python → JS (bridge.js connects these once the channel is up)
+    annotations_loaded = pyqtSignal(str)         # JSON array of [id, page, content, comment, color, rects_json]
+    annotations_confirmed = pyqtSignal(str)      # JSON array of DB ids for just-saved annotations
+    zoom = pyqtSignal(float)                     # Scale factor applied to the current zoom
 
     def __init__(self, parent: QObject = None) -> None:
         super().__init__(parent)
@@ -142,6 +199,11 @@ class JsBridge(QObject):
         logger.info("JS → Python: PDF.js viewer ready")
         self.viewer_ready.emit()
 
+    @pyqtSlot()
+    def onBridgeReady(self) -> None:
+        logger.info("JS → Python: PDF.js initialized")
+        self.bridge_ready.emit()
+
     @pyqtSlot(int)
     def onPageChanged(self, page_num: int) -> None:
         self.page_changed.emit(page_num)
@@ -165,6 +227,23 @@ class PDFViewerWidget(QWidget):
         self.current_paper_id: Optional[int] = None
         self.current_pdf_path: Optional[str] = None
         self._viewer_ready = False
+        # True once PDF.js has loaded in this page; later PDFs are opened in place
+        self._bridge_loaded = False
+
+        # Saved-annotation IDs reach JS as one JsBridge.annotations_confirmed emit per event-loop pass
+        self._pending_confirms: List[int] = []
+        self._confirm_timer = QTimer(self)
+        self._confirm_timer.setSingleShot(True)
+        self._confirm_timer.setInterval(0)
+        self._confirm_timer.timeout.connect(self._flush_confirms)
+
+        # Page changes are coalesced; the label is only rewritten when the page differs
+        self._pending_page = 0
+        self._shown_page = 0
+        self._page_timer = QTimer(self)
+        self._page_timer.setSingleShot(True)
+        self._page_timer.setInterval(PAGE_LABEL_DELAY_MS)
+        self._page_timer.timeout.connect(self._flush_page_label)
 
         self._init_ui()
         self._setup_scheme_handler()
@@ -186,19 +265,19 @@ class PDFViewerWidget(QWidget):
 
         self.btn_zoom_in = QPushButton("🔍+")
         self.btn_zoom_in.setFixedWidth(50)
-        self.btn_zoom_in.clicked.connect(lambda: self._run_js("PDFViewerApplication.pdfViewer.currentScale *= 1.1"))
+        self.btn_zoom_in.clicked.connect(lambda: self.js_bridge.zoom.emit(ZOOM_STEP))
         toolbar.addWidget(self.btn_zoom_in)
 
         self.btn_zoom_out = QPushButton("🔍−")
         self.btn_zoom_out.setFixedWidth(50)
-        self.btn_zoom_out.clicked.connect(lambda: self._run_js("PDFViewerApplication.pdfViewer.currentScale /= 1.1"))
+        self.btn_zoom_out.clicked.connect(lambda: self.js_bridge.zoom.emit(1 / ZOOM_STEP))
         toolbar.addWidget(self.btn_zoom_out)
 
         toolbar.addStretch()
 
         self.page_label = QPushButton("Page: —")
         self.page_label.setFlat(True)
-        self.page_label.setStyleSheet("color: #808080; border: none; font-size: 12px;")
+        self.page_label.setObjectName("pageLabel")
         toolbar.addWidget(self.page_label)
 
         layout.addLayout(toolbar)
@@ -206,7 +285,9 @@ class PDFViewerWidget(QWidget):
         # WebEngine view
         self.web_view = QWebEngineView()
         self._configure_web_settings()
-        self.web_view.page().setDevToolsPage(QWebEnginePage(self.web_view))
+        if DEVTOOLS_ENABLED:
+            self.web_view.page().setDevToolsPage(_shared_devtools_page())
+        self.web_view.loadStarted.connect(self._on_load_started)
         layout.addWidget(self.web_view)
 
     def _configure_web_settings(self) -> None:
@@ -235,9 +316,8 @@ class PDFViewerWidget(QWidget):
         self.js_bridge.annotation_request.connect(self._handle_annotation_request)
         self.js_bridge.context_action.connect(self._handle_context_action)
         self.js_bridge.viewer_ready.connect(self._on_viewer_ready)
-        self.js_bridge.page_changed.connect(
-            lambda p: self.page_label.setText(f"Page: {p}")
-        )
+        self.js_bridge.bridge_ready.connect(self._on_bridge_ready)
+        self.js_bridge.page_changed.connect(self._on_page_changed)
         self.js_bridge.delete_annotation.connect(self._handle_delete_annotation)
         logger.info("QWebChannel bridge initialized.")
 
@@ -245,25 +325,52 @@ class PDFViewerWidget(QWidget):
         self.current_paper_id = paper_id
         self.current_pdf_path = os.path.abspath(file_path)
         self._viewer_ready = False
+        self._confirm_timer.stop()
+        self._pending_confirms.clear()
 
-        bridge_html = RESOURCES_DIR / "viewer_bridge.html"
-        if not bridge_html.exists():
-            logger.error(f"viewer_bridge.html not found at {bridge_html}")
+        bridge_url = self._bridge_page_url()
+        if bridge_url is None:
             return
 
         pdf_path_normalized = self.current_pdf_path.replace("\\", "/")
         pdf_url = f"local:///{pdf_path_normalized}"
-        
-        bridge_path_normalized = str(bridge_html).replace("\\", "/")
-        viewer_url_str = f"local:///{bridge_path_normalized}?file={pdf_url}"
+        viewer_url_str = f"{bridge_url}?file={pdf_url}"
 
         logger.info(f"Loading PDF: {self.current_pdf_path}")
+        if self._bridge_loaded:
+            # Keep the bridge page and PDF.js alive; only the new document is fetched and parsed
+            self._run_js(f"window.openPdfAt({json.dumps(pdf_url)});")
+            return
         self.web_view.setUrl(QUrl(viewer_url_str))
 
+    def prewarm(self) -> None:
+        """Start the renderer and PDF.js with no document, so the first load_pdf opens in place."""
+        if self._bridge_loaded or self.current_pdf_path:
+            return
+        bridge_url = self._bridge_page_url()
+        if bridge_url is not None:
+            self.web_view.setUrl(QUrl(f"{bridge_url}?prewarm=1"))
+
+    @staticmethod
+    def _bridge_page_url() -> Optional[str]:
+        bridge_html = RESOURCES_DIR / "viewer_bridge.html"
+        if not bridge_html.exists():
+            logger.error(f"viewer_bridge.html not found at {bridge_html}")
+            return None
+        bridge_path_normalized = str(bridge_html).replace("\\", "/")
+        return f"local:///{bridge_path_normalized}"
+
+    def _on_load_started(self) -> None:
+        self._bridge_loaded = False
+
+    def _on_bridge_ready(self) -> None:
+        self._bridge_loaded = True
+
     def _on_viewer_ready(self) -> None:
         if self._viewer_ready:
             return 
         self._viewer_ready = True
+        self._bridge_loaded = True
         logger.info("PDF.js viewer ready, loading annotations...")
         if self.current_paper_id is not None:
             self._push_annotations_to_js()
@@ -276,19 +383,8 @@ class PDFViewerWidget(QWidget):
         if not annotations:
             return
 
-        ann_data = []
-        for a in annotations:
-            ann_data.append({
-                "id": a.id,
-                "page": a.page,
-                "content": a.content,
-                "comment": a.comment,
-                "color": a.color,
-                "rects": json.loads(a.rects_json),
-            })
-
-        js_code = f"window.loadAnnotations({json.dumps(ann_data)});"
-        self._run_js(js_code)
+        # One [id, page, content, comment, color, rects_json] row per annotation; bridge.js rebuilds the objects
+        self.js_bridge.annotations_loaded.emit(json.dumps(list(map(_ANNOTATION_ROW, annotations))))
 
     def _handle_annotation_request(self, data_json: str) -> None:
         if self.current_paper_id is None:
@@ -304,12 +400,28 @@ class PDFViewerWidget(QWidget):
                 color=data.get("color", "#FFFF00"),
                 rects_json=json.dumps(data.get("rects", [])),
             )
-            self._run_js(f"window.confirmAnnotation({ann_id});")
+            self._pending_confirms.append(ann_id)
+            self._confirm_timer.start()
             self.annotation_saved.emit(ann_id)
             logger.info(f"Annotation saved: id={ann_id}")
         except (json.JSONDecodeError, KeyError) as e:
             logger.error(f"Failed to save annotation: {e}")
 
+    def _flush_confirms(self) -> None:
+        ids = ",".join(map(str, self._pending_confirms))
+        self._pending_confirms.clear()
+        self.js_bridge.annotations_confirmed.emit(f"[{ids}]")
+
+    def _on_page_changed(self, page: int) -> None:
+        self._pending_page = page
+        if not self._page_timer.isActive():
+            self._page_timer.start()
+
+    def _flush_page_label(self) -> None:
+        if self._pending_page != self._shown_page:
+            self._shown_page = self._pending_page
+            self.page_label.setText(f"Page: {self._shown_page}")
+
     def _handle_context_action(self, action: str, text: str) -> None:
         main_win = self.window()
         if hasattr(main_win, "open_ai_with_context"):
@@ -327,7 +439,10 @@ class PDFViewerWidget(QWidget):
 
     def _refresh_pdf(self) -> None:
         if self.current_pdf_path:
-            self.web_view.reload()
+            self.scheme_handler.clear_static_cache()
+            # The page URL still names the first PDF opened in place, so navigate afresh
+            self._bridge_loaded = False
+            self.load_pdf(self.current_pdf_path, self.current_paper_id)
 
     def _run_js(self, code: str) -> None:
         self.web_view.page().runJavaScript(code)
@@ -1,60 +1,136 @@
 """
 PaperMiner - Async Workers
-QThread-based workers for all long-running operations:
+Background workers for all long-running operations. Tasks are QRunnables for the
+global QThreadPool, each with a small QObject carrying its signals:
   - AI chat (LLM API calls)
-  - Paper indexing (text extraction + embedding)
+  - PDF upload (copy into the library)
   - Paper discovery (ArXiv/HF search)
   - PDF download
+Paper indexing (text extraction + embedding) and import prewarming keep a dedicated QThread.
 """
 
 import logging
-from typing import Optional, List
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, List
 
-from PyQt6.QtCore import QThread, pyqtSignal, QObject
+from PyQt6.QtCore import QThread, QRunnable, pyqtSignal, QObject
 
 from core.database import DatabaseManager
 from core.models import TextChunk
 
+if TYPE_CHECKING:
+    from ai.chat_handler import ChatHandler
+
 logger = logging.getLogger(__name__)
 
 
-class ChatWorker(QThread):
-    """
-    Worker thread for AI chat interactions.
-    Prevents UI freezing during LLM API calls.
-    """
+class ChatWorkerSignals(QObject):
+    """Signals of a ChatWorker (QRunnable is not a QObject)."""
     response_ready = pyqtSignal(str)       # Full response text
     chunk_received = pyqtSignal(str)       # Streaming chunk
     error_occurred = pyqtSignal(str)       # Error message
     finished_signal = pyqtSignal()         # Work complete
 
-    def __init__(self, db: DatabaseManager, mode: str, message: str,
-                 paper_id: Optional[int] = None, parent: QObject = None) -> None:
-        super().__init__(parent)
-        self.db = db
+
+class ChatWorker(QRunnable):
+    """
+    Pooled task for AI chat interactions.
+    Prevents UI freezing during LLM API calls; start it with
+    QThreadPool.globalInstance().start(worker). Signals are created on the
+    caller's thread, so connected GUI slots are invoked through queued connections.
+    The handler is the caller's long-lived one, so its history carries across turns;
+    run only one worker per handler at a time.
+    """
+
+    def __init__(self, handler: "ChatHandler", mode: str, message: str,
+                 paper_id: Optional[int] = None) -> None:
+        super().__init__()
+        self.signals = ChatWorkerSignals()
+        self.handler = handler
         self.mode = mode           # "Chat with Paper" | "Chat with Library" | "Free Chat"
         self.message = message
         self.paper_id = paper_id
 
     def run(self) -> None:
         try:
-            from ai.chat_handler import ChatHandler
-
-            handler = ChatHandler(self.db)
-
+            handler = self.handler
             if self.mode == "Chat with Paper" and self.paper_id is not None:
-                response = handler.chat_with_paper(self.paper_id, self.message)
+                stream = handler.chat_with_paper_stream(self.paper_id, self.message)
             elif self.mode == "Chat with Library":
-                response = handler.chat_with_library(self.message)
+                stream = handler.chat_with_library_stream(self.message)
             else:
-                response = handler.free_chat(self.message)
+                stream = handler.free_chat_stream(self.message)
 
-            self.response_ready.emit(response)
+            # Show tokens as they arrive; the full text follows for history/persistence
+            parts: List[str] = []
+            for piece in stream:
+                parts.append(piece)
+                self.signals.chunk_received.emit(piece)
+
+            self.signals.response_ready.emit("".join(parts))
         except Exception as e:
             logger.error(f"ChatWorker error: {e}")
-            self.error_occurred.emit(str(e))
+            self.signals.error_occurred.emit(str(e))
         finally:
-            self.finished_signal.emit()
+            self.signals.finished_signal.emit()
+
+
+class CopyWorkerSignals(QObject):
+    """Signals of a CopyWorker."""
+    finished_signal = pyqtSignal(list)      # filenames added to the library
+    error_occurred = pyqtSignal(str)
+
+
+class CopyWorker(QRunnable):
+    """
+    Pooled task that copies uploaded PDFs into the library and registers them,
+    so large files on slow disks do not block painting. Copies run in parallel;
+    the papers are then inserted in a single transaction.
+    """
+    MAX_PARALLEL_COPIES = 4
+
+    def __init__(self, db: DatabaseManager, src_paths: List[str], dest_dir: str,
+                 folder_id: int) -> None:
+        super().__init__()
+        self.signals = CopyWorkerSignals()
+        self.db = db
+        self.src_paths = src_paths
+        self.dest_dir = dest_dir
+        self.folder_id = folder_id
+
+    def _copy(self, src_path: str) -> str:
+        dest_path = os.path.join(self.dest_dir, os.path.basename(src_path))
+        # copy2 already uses the platform fast-copy path (sendfile / CopyFile2)
+        shutil.copy2(src_path, dest_path)
+        return dest_path
+
+    def run(self) -> None:
+        copied: List[str] = []
+        errors: List[str] = []
+        workers = min(self.MAX_PARALLEL_COPIES, len(self.src_paths))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._copy, src) for src in self.src_paths]
+            for src, future in zip(self.src_paths, futures):
+                try:
+                    copied.append(future.result())
+                except Exception as e:
+                    logger.error(f"CopyWorker error for {src}: {e}")
+                    errors.append(f"{os.path.basename(src)}: {e}")
+
+        try:
+            if copied:
+                self.db.add_papers_bulk(
+                    [(os.path.basename(d), d, self.folder_id, "", "", "") for d in copied]
+                )
+                self.signals.finished_signal.emit([os.path.basename(d) for d in copied])
+        except Exception as e:
+            logger.error(f"CopyWorker error: {e}")
+            errors.append(str(e))
+        if errors:
+            self.signals.error_occurred.emit("\n".join(errors))
 
 
 class IndexWorker(QThread):
@@ -85,8 +161,7 @@ class IndexWorker(QThread):
                 return
 
             self.progress.emit(f"Saving {len(chunks)} chunks to database...")
-            for chunk in chunks:
-                chunk.paper_id = self.paper_id
+            # save_chunks binds paper_id itself; the chunk objects are not touched
             self.db.save_chunks(self.paper_id, chunks)
             self.db.set_paper_indexed(self.paper_id, True)
 
@@ -97,17 +172,22 @@ class IndexWorker(QThread):
             self.error_occurred.emit(str(e))
 
 
-class SearchWorker(QThread):
-    """
-    Worker thread for paper discovery searches (ArXiv, HuggingFace).
-    """
+class SearchWorkerSignals(QObject):
+    """Signals of a SearchWorker."""
     results_ready = pyqtSignal(list)       # List of result dicts
     error_occurred = pyqtSignal(str)
     finished_signal = pyqtSignal()
 
+
+class SearchWorker(QRunnable):
+    """
+    Pooled task for paper discovery searches (ArXiv, HuggingFace).
+    """
+
     def __init__(self, source: str, keyword: str, max_results: int = 10,
-                 sort_by: str = "relevance", parent: QObject = None) -> None:
-        super().__init__(parent)
+                 sort_by: str = "relevance") -> None:
+        super().__init__()
+        self.signals = SearchWorkerSignals()
         self.source = source
         self.keyword = keyword
         self.max_results = max_results
@@ -129,46 +209,73 @@ class SearchWorker(QThread):
                 hf_results = search_hf_papers(self.keyword, max_results=self.max_results)
                 results.extend(hf_results)
 
-            self.results_ready.emit(results)
+            self.signals.results_ready.emit(results)
         except Exception as e:
             logger.error(f"SearchWorker error: {e}")
-            self.error_occurred.emit(str(e))
+            self.signals.error_occurred.emit(str(e))
         finally:
-            self.finished_signal.emit()
+            self.signals.finished_signal.emit()
 
 
-class DownloadWorker(QThread):
-    """
-    Worker thread for downloading papers (e.g., from ArXiv).
-    """
+class DownloadWorkerSignals(QObject):
+    """Signals of a DownloadWorker."""
     progress = pyqtSignal(str)
     download_complete = pyqtSignal(str)    # Local file path
     error_occurred = pyqtSignal(str)
 
-    def __init__(self, url: str, save_dir: str, filename: str,
-                 parent: QObject = None) -> None:
-        super().__init__(parent)
+
+class DownloadWorker(QRunnable):
+    """
+    Pooled task for downloading papers (e.g., from ArXiv).
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, url: str, save_dir: str, filename: str) -> None:
+        super().__init__()
+        self.signals = DownloadWorkerSignals()
         self.url = url
         self.save_dir = save_dir
         self.filename = filename
 
     def run(self) -> None:
         try:
-            import httpx
-            from pathlib import Path
+            from discovery.http_client import get_download_client
 
             dest = Path(self.save_dir) / self.filename
-            self.progress.emit(f"Downloading {self.filename}...")
+            self.signals.progress.emit(f"Downloading {self.filename}...")
 
-            with httpx.Client(timeout=60.0, follow_redirects=True) as client:
-                with client.stream("GET", self.url) as response:
-                    response.raise_for_status()
-                    with open(dest, "wb") as f:
-                        for chunk in response.iter_bytes(chunk_size=8192):
-                            f.write(chunk)
+            # Shared keep-alive client: repeat downloads from a host skip the TCP/TLS handshake
+            with get_download_client().stream("GET", self.url) as response:
+                response.raise_for_status()
+                with open(dest, "wb") as f:
+                    for chunk in response.iter_bytes(chunk_size=self.CHUNK_SIZE):
+                        f.write(chunk)
 
-            self.progress.emit(f"Download complete: {self.filename}")
-            self.download_complete.emit(str(dest))
+            self.signals.progress.emit(f"Download complete: {self.filename}")
+            self.signals.download_complete.emit(str(dest))
         except Exception as e:
             logger.error(f"DownloadWorker error: {e}")
-            self.error_occurred.emit(str(e))
+            self.signals.error_occurred.emit(str(e))
+
+
+class PrewarmWorker(QThread):
+    """
+    Imports the heavy AI/PDF dependencies in the background after the first paint,
+    so the first chat, indexing or discovery request does not pay for them.
+    Models are not loaded here; they still load on the first query.
+    """
+
+    def run(self) -> None:
+        try:
+            import fitz  # noqa: F401  (pymupdf)
+            import numpy  # noqa: F401
+            from ai.llm_client import _get_httpx
+            _get_httpx()
+            import ai.chat_handler  # noqa: F401  (pulls in rag_engine / vector_index)
+            from ai.rag_engine import warm_top_k_kernel
+            warm_top_k_kernel()
+            import discovery.arxiv_client  # noqa: F401  (SearchWorker / DownloadWorker)
+            import discovery.hf_client  # noqa: F401
+            logger.debug("Prewarmed AI and PDF modules.")
+        except Exception as e:
+            logger.warning(f"Prewarm failed: {e}")